@@ -0,0 +1,87 @@
+"""
+Intent Batcher - Coalesces intent parses that arrive close together
+Requests submitted within a short window are parsed concurrently so Ollama
+round-trips overlap instead of running one after another
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class IntentBatcher:
+    """Collects parse requests for a short window and runs them as one batch."""
+
+    def __init__(self, intent_parser, window: float = 0.015, max_batch: Optional[int] = None):
+        self.intent_parser = intent_parser
+        self.window = window
+        self.max_batch = max_batch or getattr(intent_parser.llm_client, "num_parallel", 4)
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        # In-flight parses; the loop only keeps weak references to tasks
+        self._tasks = set()
+
+    async def submit(self, text: str) -> Optional[Dict[str, Any]]:
+        """Queue text for parsing and wait for its intent."""
+        loop = asyncio.get_running_loop()
+        # Queues and tasks belong to one loop; start over if the caller's loop changed
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue in windows and start each batch without waiting on it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            if len(batch) > 1:
+                logger.debug(f"Parsing {len(batch)} intents in one batch")
+            # Each parse runs as its own task so the next window opens right away;
+            # the client's limiter, not this loop, caps how many generate at once
+            for text, future in batch:
+                # A caller that gave up while queued (a stale speculation) costs nothing
+                if future.cancelled():
+                    continue
+                task = loop.create_task(self.intent_parser.parse(text))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(functools.partial(self._settle, future))
+                # Cancelling submit() cancels the future it awaits; carry that
+                # through to the parse so its request stops holding a slot
+                future.add_done_callback(functools.partial(self._cancel_if_abandoned, task))
+
+    @staticmethod
+    def _cancel_if_abandoned(task: asyncio.Task, future: asyncio.Future):
+        """Cancel a parse whose caller cancelled its submit()."""
+        if future.cancelled():
+            task.cancel()
+
+    @staticmethod
+    def _settle(future: asyncio.Future, task: asyncio.Task):
+        """Pass a finished parse on to the caller waiting in submit()."""
+        if future.done():
+            return
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
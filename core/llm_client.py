@@ -5,28 +5,59 @@ Handles communication with Ollama API at localhost:11434
 
 import asyncio
 import json
+import os
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment."""
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}; using {default}")
+        return default
+
 class OllamaClient:
     """Client for communicating with Ollama local API."""
     
-    def __init__(self, base_url="http://localhost:11434", model="gemma3:12b", timeout=30):
+    def __init__(self, base_url="http://localhost:11434", model="gemma3:12b", timeout=30, keep_alive=-1):
         self.base_url = base_url
         self.model = model
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # How long Ollama keeps the model loaded after a request; -1 keeps it resident
+        self.keep_alive = keep_alive
+        # Matches the server's OLLAMA_NUM_PARALLEL so callers don't queue more than it runs
+        self.num_parallel = _env_int("OLLAMA_NUM_PARALLEL", 4)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+        )
+        self._semaphore = None
+        self._semaphore_loop = None
         
     async def __aenter__(self):
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close pooled connections."""
         await self.client.aclose()
     
+    def _limiter(self) -> asyncio.Semaphore:
+        """Semaphore capping in-flight generations at num_parallel on the running loop."""
+        # asyncio primitives are tied to one loop, and callers may switch loops
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.num_parallel)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
     async def is_available(self) -> bool:
         """Check if Ollama server is running and accessible."""
         try:
@@ -48,26 +79,85 @@ class OllamaClient:
             logger.error(f"Failed to list models: {e}")
             return []
     
+    def _generate_payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9,
+                "max_tokens": 1000
+            }
+        }
+    
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response text from Ollama as it is generated."""
+        payload = self._generate_payload(prompt, stream=True)
+        async with self._limiter():
+            async with self.client.stream("POST", f"{self.base_url}/api/generate", json=payload) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    logger.error(f"Ollama API error: {response.status_code} - {body.decode(errors='replace')}")
+                    return
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        # Failures after the 200 (e.g. the model unloaded mid-stream) arrive in-band
+                        logger.error(f"Ollama stream error: {chunk['error']}")
+                        return
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+    
+    async def _generate_json_text(self, prompt: str) -> str:
+        """Stream a completion and stop reading once the first JSON object closes."""
+        parts = []
+        depth = 0
+        started = in_string = escaped = False
+        chunks = self.stream(prompt)
+        try:
+            async for delta in chunks:
+                parts.append(delta)
+                for ch in delta:
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif ch == "\\":
+                            escaped = True
+                        elif ch == '"':
+                            in_string = False
+                    elif ch == '"' and started:
+                        in_string = True
+                    elif ch == "{":
+                        depth += 1
+                        started = True
+                    elif ch == "}" and started:
+                        depth -= 1
+                        if depth == 0:
+                            return "".join(parts)
+        finally:
+            # Closing the stream early tells Ollama to stop generating
+            await chunks.aclose()
+        return "".join(parts)
+    
     async def generate(self, prompt: str, max_retries=3) -> Optional[str]:
         """Generate text using Ollama with retry logic."""
         for attempt in range(max_retries):
             try:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "max_tokens": 1000
-                    }
-                }
+                payload = self._generate_payload(prompt, stream=False)
                 
                 start_time = time.time()
-                response = await self.client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                )
+                async with self._limiter():
+                    response = await self.client.post(
+                        f"{self.base_url}/api/generate",
+                        json=payload
+                    )
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -88,6 +178,21 @@ class OllamaClient:
         
         return None
     
+    async def warmup(self, prompt: str = "ok") -> bool:
+        """Load the model ahead of the first real request with a one-token completion."""
+        payload = self._generate_payload(prompt, stream=False)
+        payload["options"] = {"num_predict": 1}
+        try:
+            async with self._limiter():
+                response = await self.client.post(f"{self.base_url}/api/generate", json=payload)
+            if response.status_code == 200:
+                logger.info(f"Model {self.model} loaded")
+                return True
+            logger.warning(f"Model warm-up failed: {response.status_code} - {response.text}")
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+        return False
+    
     async def generate_structured(self, prompt: str, schema: Dict[str, Any], max_retries=3) -> Optional[Dict]:
         """Generate structured JSON response using Ollama."""
         # Add JSON formatting instruction to prompt
@@ -102,19 +207,16 @@ Your response should be ONLY the JSON object, no additional text or explanations
         
         for attempt in range(max_retries):
             try:
-                response_text = await self.generate(structured_prompt, max_retries=1)
+                # Anything the model writes after the closing brace is discarded anyway
+                response_text = await self._generate_json_text(structured_prompt)
                 if not response_text:
                     continue
                 
                 # Try to extract JSON from response
                 response_text = response_text.strip()
                 
-                # Handle cases where LLM adds extra text
-                if "```json" in response_text:
-                    start = response_text.find("```json") + 7
-                    end = response_text.find("```", start)
-                    response_text = response_text[start:end].strip()
-                elif "{" in response_text and "}" in response_text:
+                # Handle cases where LLM adds extra text or a ```json fence
+                if "{" in response_text and "}" in response_text:
                     start = response_text.find("{")
                     end = response_text.rfind("}") + 1
                     response_text = response_text[start:end]
@@ -5,9 +5,14 @@ Implements safety checks and dry-run functionality
 
 import asyncio
 import logging
+import re
+import sys
 import time
+import types
+import webbrowser
 from typing import Dict, Any, Optional
 from datetime import datetime
+from urllib.parse import urlencode
 
 from .safety import SafetyManager, CapabilityManager
 from commands.open_apps import AppLauncher
@@ -17,6 +22,35 @@ from commands.window_control import WindowController
 
 logger = logging.getLogger(__name__)
 
+# "x, y" coordinate pair accepted as a click_at target
+_COORD_RE = re.compile(r'^\s*(-?\d+)\s*,\s*(-?\d+)\s*$')
+
+# Map intents to required capabilities. Keys are interned so lookups with
+# the literal intent names hit the identity fast path.
+_INTENT_CAPS = types.MappingProxyType({sys.intern(k): v for k, v in {
+    'open_app': 'window_control',
+    'close_app': 'process_control',
+    'switch_app': 'window_control',
+    'read_file': 'fs',
+    'write_file': 'fs',
+    'list_files': 'fs',
+    'find_file': 'fs',
+    'run_command': 'run_shell',
+    'kill_process': 'process_control',
+    'list_processes': 'process_control',
+    'search_web': 'browser_control',
+    'open_url': 'browser_control',
+    'get_time': None,  # No special capability required
+    'get_system_info': 'system_info',
+    'focus_window': 'window_control',
+    'click_at': 'window_control',
+    'type_text': 'window_control',
+    'screenshot': 'screenshot',
+    'help': None,
+    'ask_for_clarification': None,
+    'exit': None
+}.items()})
+
 class TaskRouter:
     """Routes intents to appropriate handlers with safety controls."""
     
@@ -59,77 +93,52 @@ class TaskRouter:
         }
         
         # Map intents to required capabilities
-        self.intent_capabilities = {
-            'open_app': 'window_control',
-            'close_app': 'process_control',
-            'switch_app': 'window_control',
-            'read_file': 'fs',
-            'write_file': 'fs',
-            'list_files': 'fs',
-            'find_file': 'fs',
-            'run_command': 'run_shell',
-            'kill_process': 'process_control',
-            'list_processes': 'process_control',
-            'search_web': 'browser_control',
-            'open_url': 'browser_control',
-            'get_time': None,  # No special capability required
-            'get_system_info': 'system_info',
-            'focus_window': 'window_control',
-            'click_at': 'window_control',
-            'type_text': 'window_control',
-            'screenshot': 'screenshot',
-            'help': None,
-            'ask_for_clarification': None,
-            'exit': None
+        self.intent_capabilities = _INTENT_CAPS
+        
+        # Pre-bind (handler, capability) per intent so execute() resolves both in one lookup.
+        # A dict is used rather than a `match` statement: CPython compiles string cases to
+        # sequential comparisons, and `match` needs Python 3.10+ while 3.9 is still supported.
+        self._dispatch = {
+            name: (handler, _INTENT_CAPS.get(name))
+            for name, handler in self.intent_handlers.items()
         }
     
     async def execute(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         """Execute an intent with safety checks."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Validate intent structure
             if not self._validate_intent(intent):
-                return {
-                    'success': False,
-                    'message': 'Invalid intent structure',
-                    'error': 'Missing required fields',
-                    'execution_time': time.time() - start_time
-                }
+                return self._err('Invalid intent structure', 'Missing required fields', start_ns)
             
             intent_type = intent['intent']
             target = intent['target']
             options = intent.get('options', {})
             
+            # Check if handler exists
+            entry = self._dispatch.get(intent_type)
+            if entry is None:
+                return self._err(f'Unknown intent: {intent_type}', f'No handler for intent "{intent_type}"', start_ns)
+            handler, required_capability = entry
+            
             # Check if capability is required and enabled
-            required_capability = self.intent_capabilities.get(intent_type)
             if required_capability and not self.capability_manager.is_enabled(required_capability):
-                return {
-                    'success': False,
-                    'message': f'Capability "{required_capability}" is not enabled',
-                    'error': f'Intent "{intent_type}" requires capability "{required_capability}"',
-                    'execution_time': time.time() - start_time
-                }
+                return self._err(
+                    f'Capability "{required_capability}" is not enabled',
+                    f'Intent "{intent_type}" requires capability "{required_capability}"',
+                    start_ns
+                )
             
             # Apply dry run override - always set the current mode
             options['dry_run'] = self.dry_run
             
-            # Check if handler exists
-            handler = self.intent_handlers.get(intent_type)
-            if not handler:
-                return {
-                    'success': False,
-                    'message': f'Unknown intent: {intent_type}',
-                    'error': f'No handler for intent "{intent_type}"',
-                    'execution_time': time.time() - start_time
-                }
-            
             # Execute the handler
             logger.info(f"Executing intent: {intent_type} with target: {target}")
             result = await handler(target, options)
             
             # Add execution metadata
-            result['execution_time'] = time.time() - start_time
+            result['execution_time'] = (time.perf_counter_ns() - start_ns) / 1e9
             result['timestamp'] = datetime.now().isoformat()
             result['intent_type'] = intent_type
             result['dry_run'] = options.get('dry_run', False)
@@ -138,12 +147,23 @@ class TaskRouter:
             
         except Exception as e:
             logger.error(f"Task execution failed: {e}")
-            return {
-                'success': False,
-                'message': 'Task execution failed',
-                'error': str(e),
-                'execution_time': time.time() - start_time
-            }
+            return self._err('Task execution failed', str(e), start_ns)
+    
+    def _err(self, message: str, error: str, start_ns: int) -> Dict[str, Any]:
+        """Build a failed execution result."""
+        return {
+            'success': False,
+            'message': message,
+            'error': error,
+            'execution_time': (time.perf_counter_ns() - start_ns) / 1e9
+        }
+    
+    @staticmethod
+    def _passthrough(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a command result as-is, filling in the fields execute() relies on."""
+        result.setdefault('success', False)
+        result.setdefault('message', '')
+        return result
     
     def _validate_intent(self, intent: Dict[str, Any]) -> bool:
         """Validate intent structure."""
@@ -156,12 +176,8 @@ class TaskRouter:
         """Handle app opening intent."""
         try:
             result = await self.app_launcher.open_app(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to open app: {e}'}
     
     async def _handle_close_app(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
@@ -189,38 +205,25 @@ class TaskRouter:
                 }
             
             result = await self.process_manager.kill_process_by_name(target)
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
+            return self._passthrough(result)
             
-        except Exception as e:
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to close app: {e}'}
     
     async def _handle_switch_app(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle app switching intent."""
         try:
             result = await self.window_controller.focus_window(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to switch app: {e}'}
     
     async def _handle_read_file(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle file reading intent."""
         try:
             result = await self.fs_manager.read_file(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'content': result.get('content', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to read file: {e}'}
     
     async def _handle_write_file(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
@@ -236,38 +239,24 @@ class TaskRouter:
             result = await self.fs_manager.write_file(
                 target, content, dry_run=options.get('dry_run', False)
             )
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to write file: {e}'}
     
     async def _handle_list_files(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle file listing intent."""
         try:
             result = await self.fs_manager.list_files(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'files': result.get('files', []),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to list files: {e}'}
     
     async def _handle_find_file(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle file finding intent."""
         try:
             result = await self.fs_manager.find_file(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'matches': result.get('matches', []),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to find file: {e}'}
     
     async def _handle_run_command(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
@@ -301,7 +290,7 @@ class TaskRouter:
                 'output': '[Command execution not implemented in demo]'
             }
             
-        except Exception as e:
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to execute command: {e}'}
     
     async def _handle_kill_process(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
@@ -315,32 +304,21 @@ class TaskRouter:
                 }
             
             result = await self.process_manager.kill_process_by_name(target)
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to kill process: {e}'}
     
     async def _handle_list_processes(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle process listing intent."""
         try:
             result = await self.process_manager.list_processes(filter_name=target if target else None)
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'processes': result.get('processes', []),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to list processes: {e}'}
     
     async def _handle_search_web(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle web search intent."""
         try:
-            import webbrowser
-            
             if options.get('dry_run', False):
                 return {
                     'success': True,
@@ -348,7 +326,7 @@ class TaskRouter:
                     'action': 'search_web'
                 }
             
-            search_url = f"https://www.google.com/search?q={target.replace(' ', '+')}"
+            search_url = "https://www.google.com/search?" + urlencode({'q': target})
             webbrowser.open(search_url)
             
             return {
@@ -356,14 +334,12 @@ class TaskRouter:
                 'message': f'Opened web search for: {target}',
                 'url': search_url
             }
-        except Exception as e:
+        except (webbrowser.Error, OSError) as e:
             return {'success': False, 'message': f'Failed to search web: {e}'}
     
     async def _handle_open_url(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle URL opening intent."""
         try:
-            import webbrowser
-            
             if options.get('dry_run', False):
                 return {
                     'success': True,
@@ -377,20 +353,17 @@ class TaskRouter:
                 'message': f'Opened URL: {target}',
                 'url': target
             }
-        except Exception as e:
+        except (webbrowser.Error, OSError) as e:
             return {'success': False, 'message': f'Failed to open URL: {e}'}
     
     async def _handle_get_time(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle time query intent."""
-        try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return {
-                'success': True,
-                'message': f'Current time: {current_time}',
-                'time': current_time
-            }
-        except Exception as e:
-            return {'success': False, 'message': f'Failed to get time: {e}'}
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        return {
+            'success': True,
+            'message': f'Current time: {current_time}',
+            'time': current_time
+        }
     
     async def _handle_get_system_info(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle system info query intent."""
@@ -398,12 +371,16 @@ class TaskRouter:
             import psutil
             import platform
             
+            os_name = platform.system()
+            # The one-second CPU sample runs on a worker thread so it doesn't stall the loop
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 1)
+            
             info = {
-                'os': platform.system(),
+                'os': os_name,
                 'os_version': platform.version(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
+                'cpu_percent': cpu_percent,
                 'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': psutil.disk_usage('/').percent if platform.system() != 'Windows' else psutil.disk_usage('C:').percent
+                'disk_usage': psutil.disk_usage('C:' if os_name == 'Windows' else '/').percent
             }
             
             message = f"System: {info['os']} | CPU: {info['cpu_percent']}% | Memory: {info['memory_percent']}% | Disk: {info['disk_usage']}%"
@@ -413,19 +390,15 @@ class TaskRouter:
                 'message': message,
                 'system_info': info
             }
-        except Exception as e:
+        except (ImportError, OSError) as e:
             return {'success': False, 'message': f'Failed to get system info: {e}'}
     
     async def _handle_focus_window(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle window focusing intent."""
         try:
             result = await self.window_controller.focus_window(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to focus window: {e}'}
     
     async def _handle_click_at(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
@@ -436,47 +409,33 @@ class TaskRouter:
             
             if x == 0 and y == 0 and target:
                 # Try to parse coordinates from target
-                try:
-                    coords = target.split(',')
-                    x = int(coords[0].strip())
-                    y = int(coords[1].strip())
-                except:
+                match = _COORD_RE.match(target)
+                if not match:
                     return {
                         'success': False,
                         'message': 'Invalid coordinates specified'
                     }
+                x, y = int(match.group(1)), int(match.group(2))
             
             result = await self.window_controller.click_at(x, y, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to click: {e}'}
     
     async def _handle_type_text(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle text typing intent."""
         try:
             result = await self.window_controller.type_text(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to type text: {e}'}
     
     async def _handle_screenshot(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Handle screenshot intent."""
         try:
             result = await self.window_controller.take_screenshot(target, dry_run=options.get('dry_run', False))
-            return {
-                'success': result.get('success', False),
-                'message': result.get('message', ''),
-                'details': result
-            }
-        except Exception as e:
+            return self._passthrough(result)
+        except (OSError, ValueError) as e:
             return {'success': False, 'message': f'Failed to take screenshot: {e}'}
     
     async def _handle_help(self, target: str, options: Dict[str, Any]) -> Dict[str, Any]:
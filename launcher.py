@@ -6,19 +6,176 @@ Choose between Streamlit web GUI or native Windows desktop GUI.
 
 import sys
 import os
+import argparse
+import hashlib
+import importlib.util
+import json
+import shutil
+import site
 import subprocess
-import tkinter as tk
-from tkinter import ttk, messagebox
+import threading
+import time
+import urllib.error
+import urllib.request
+from importlib import metadata
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# Tk is only imported once the launcher window is needed (see _import_tk), so
+# the --desktop/--web/--cli fast path never pays for it
+tk = ttk = messagebox = tkfont = None
+
+OLLAMA_TAGS_URL = "http://127.0.0.1:11434/api/tags"
+
+# Scripts started by --desktop / --web / --cli, with their default arguments
+MODE_TARGETS = {
+    "desktop": ("windows_app.py", []),
+    "web": ("start.py", []),
+    "cli": ("start.py", ["--dry-run"]),
+}
+
+STATUS_CACHE_FILE = Path.home() / ".agent_desktop_ai" / "cache" / "launcher_status.json"
+STATUS_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def _probe_python():
+    """Report the running Python version."""
+    return "✓ Python {}.{}.{}".format(*sys.version_info[:3])
+
+
+def _present(name):
+    """Check whether a module is installed without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+def _version(package):
+    """Return an installed distribution's version without importing it."""
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _probe_packages(packages, ok_message, missing_message):
+    """Report whether all of the given packages are installed.
+    
+    ok_message may reference each package's version as {package}.
+    """
+    versions = {package: _version(package) for package in packages}
+    if None in versions.values():
+        return missing_message
+    return ok_message.format(**versions)
+
+
+def _probe_ollama():
+    """Report whether the Ollama service responds."""
+    # Ask the daemon's HTTP API directly instead of spawning the ollama CLI
+    try:
+        with urllib.request.urlopen(OLLAMA_TAGS_URL, timeout=0.3) as response:
+            if response.status == 200:
+                return "✓ Ollama AI service available"
+    except (urllib.error.URLError, OSError):
+        pass
+    except Exception:
+        return "⚠ Ollama status unknown"
+    
+    if shutil.which('ollama'):
+        return "⚠ Ollama installed but not responding"
+    return "⚠ Ollama not installed - install from https://ollama.ai"
+
+
+def _run_probe(name, probe):
+    """Run one probe, turning an unexpected failure into its status line.
+
+    Returns (message, failed) so failed lines can be kept out of the cache.
+    """
+    try:
+        return probe(), False
+    except Exception as e:
+        return f"❌ {name}: {e}", True
+
+
+# Independent dependency checks shown in the status pane, in display order
+STATUS_PROBES = [
+    ("python", _probe_python),
+    ("psutil", partial(_probe_packages, ("psutil",),
+                       "✓ System monitoring (psutil {psutil})",
+                       "❌ System monitoring (psutil) - install with: pip install psutil")),
+    ("requests", partial(_probe_packages, ("requests",),
+                         "✓ HTTP client (requests {requests})",
+                         "❌ HTTP client (requests) - install with: pip install requests")),
+    ("streamlit", partial(_probe_packages, ("streamlit",),
+                          "✓ Web interface (streamlit {streamlit})",
+                          "⚠ Web interface (streamlit) - install with: pip install streamlit")),
+    ("ollama", _probe_ollama),
+    ("voice", partial(_probe_packages, ("sounddevice", "vosk"),
+                      "✓ Voice recognition available (sounddevice {sounddevice}, vosk {vosk})",
+                      "⚠ Voice recognition - install with: pip install sounddevice vosk")),
+]
+
+# Probes whose answer can change without the Python environment changing
+LIVE_PROBES = {"ollama"}
+
+
+def _environment_key():
+    """Fingerprint the interpreter and its installed packages."""
+    paths = list(getattr(site, "getsitepackages", lambda: [])())
+    paths.append(site.getusersitepackages())
+    mtimes = [os.path.getmtime(path) for path in paths if os.path.isdir(path)]
+    raw = f"{sys.executable}|{sys.version}|{max(mtimes, default=0)}"
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
+
+def _load_cached_status(key):
+    """Return cached probe results for this environment, if still fresh."""
+    try:
+        data = json.loads(STATUS_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    
+    if data.get("key") != key or time.time() - data.get("created", 0) > STATUS_CACHE_TTL:
+        return {}
+    return data.get("results", {})
+
+
+def _save_cached_status(key, results):
+    """Persist probe results for this environment."""
+    try:
+        STATUS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATUS_CACHE_FILE.write_text(
+            json.dumps({"key": key, "created": time.time(), "results": results}),
+            encoding='utf-8'
+        )
+    except OSError:
+        pass
+
+
+def _import_tk():
+    """Import the Tk modules used by the launcher window."""
+    global tk, ttk, messagebox, tkfont
+    import tkinter as tk
+    import tkinter.font as tkfont
+    from tkinter import ttk, messagebox
+
+
 class LauncherWindow:
     """Simple launcher window to choose interface type."""
     
-    def __init__(self):
+    def __init__(self, use_cache=True):
+        _import_tk()
+        self.use_cache = use_cache
+        self.refresh_files()
         self.root = tk.Tk()
         self.setup_window()
+        self.setup_styles()
         self.create_ui()
     
+    def refresh_files(self):
+        """Snapshot the working directory's file names with a single scan."""
+        with os.scandir(".") as entries:
+            self._files = {entry.name for entry in entries}
+    
     def setup_window(self):
         """Configure the launcher window."""
         self.root.title("🚀 Agent Desktop AI Extended - Launcher")
@@ -39,6 +196,23 @@ class LauncherWindow:
         except:
             pass
     
+    def setup_styles(self):
+        """Configure named fonts and ttk styles so each font is created once."""
+        self.fonts = {
+            'title': tkfont.Font(family='Segoe UI', size=16, weight='bold'),
+            'dialog': tkfont.Font(family='Segoe UI', size=14, weight='bold'),
+            'body': tkfont.Font(family='Segoe UI', size=10),
+            'small': tkfont.Font(family='Segoe UI', size=9),
+            'mono': tkfont.Font(family='Consolas', size=9),
+        }
+        
+        self.style = ttk.Style()
+        self.style.configure('Title.TLabel', font=self.fonts['title'])
+        self.style.configure('Subtitle.TLabel', font=self.fonts['body'])
+        self.style.configure('Description.TLabel', font=self.fonts['small'], foreground='gray')
+        self.style.configure('Dialog.TLabel', font=self.fonts['dialog'])
+        self.style.configure('Status.TLabel', font=self.fonts['mono'])
+    
     def create_ui(self):
         """Create the launcher interface."""
         # Main container with padding
@@ -49,14 +223,14 @@ class LauncherWindow:
         title_label = ttk.Label(
             main_frame, 
             text="🤖 Agent Desktop AI Extended",
-            font=('Segoe UI', 16, 'bold')
+            style='Title.TLabel'
         )
         title_label.pack(pady=(0, 10))
         
         subtitle_label = ttk.Label(
             main_frame,
             text="Local AI Assistant with Safety Controls",
-            font=('Segoe UI', 10)
+            style='Subtitle.TLabel'
         )
         subtitle_label.pack(pady=(0, 30))
         
@@ -79,8 +253,7 @@ class LauncherWindow:
         desktop_desc = ttk.Label(
             desktop_frame,
             text="Native Windows application with modern UI",
-            font=('Segoe UI', 9),
-            foreground='gray'
+            style='Description.TLabel'
         )
         desktop_desc.pack(side=tk.LEFT, padx=(10, 0))
         
@@ -99,8 +272,7 @@ class LauncherWindow:
         web_desc = ttk.Label(
             web_frame,
             text="Browser-based interface (requires browser)",
-            font=('Segoe UI', 9),
-            foreground='gray'
+            style='Description.TLabel'
         )
         web_desc.pack(side=tk.LEFT, padx=(10, 0))
         
@@ -119,8 +291,7 @@ class LauncherWindow:
         cli_desc = ttk.Label(
             cli_frame,
             text="Text-based terminal interface",
-            font=('Segoe UI', 9),
-            foreground='gray'
+            style='Description.TLabel'
         )
         cli_desc.pack(side=tk.LEFT, padx=(10, 0))
         
@@ -129,11 +300,12 @@ class LauncherWindow:
         status_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
         
         # Check dependencies
-        self.status_text = tk.Text(status_frame, height=6, wrap=tk.WORD, state=tk.DISABLED, 
-                                  font=('Consolas', 9), bg='#f8f8f8')
-        self.status_text.pack(fill=tk.BOTH, expand=True)
+        self.status_label = ttk.Label(status_frame, style='Status.TLabel', justify=tk.LEFT, anchor=tk.NW)
+        self.status_label.pack(fill=tk.BOTH, expand=True)
         
-        self.check_system_status()
+        # Probe after the first paint so the window shows up immediately
+        self._render_status(["Checking dependencies…"])
+        self.root.after(50, self.check_system_status)
         
         # Bottom buttons
         button_frame = ttk.Frame(main_frame)
@@ -158,131 +330,126 @@ class LauncherWindow:
         ).pack(side=tk.RIGHT)
     
     def check_system_status(self):
-        """Check system status and dependencies."""
-        self.status_text.config(state=tk.NORMAL)
-        self.status_text.delete(1.0, tk.END)
-        
-        status_messages = []
-        
-        # Check Python version
-        import platform
-        python_version = platform.python_version()
-        status_messages.append(f"✓ Python {python_version}")
-        
-        # Check core dependencies
-        try:
-            import psutil
-            status_messages.append("✓ System monitoring (psutil)")
-        except ImportError:
-            status_messages.append("❌ System monitoring (psutil) - install with: pip install psutil")
-        
-        try:
-            import requests
-            status_messages.append("✓ HTTP client (requests)")
-        except ImportError:
-            status_messages.append("❌ HTTP client (requests) - install with: pip install requests")
-        
-        try:
-            import streamlit
-            status_messages.append("✓ Web interface (streamlit)")
-        except ImportError:
-            status_messages.append("⚠ Web interface (streamlit) - install with: pip install streamlit")
-        
-        # Check Ollama
-        try:
-            import subprocess
-            result = subprocess.run(['ollama', 'list'], capture_output=True, timeout=5)
-            if result.returncode == 0:
-                status_messages.append("✓ Ollama AI service available")
-            else:
-                status_messages.append("⚠ Ollama installed but not responding")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            status_messages.append("⚠ Ollama not installed - install from https://ollama.ai")
-        except Exception:
-            status_messages.append("⚠ Ollama status unknown")
-        
-        # Check voice dependencies
+        """Check system status and dependencies without blocking the UI."""
+        threading.Thread(target=self._collect_status, daemon=True).start()
+    
+    def _collect_status(self):
+        """Run dependency probes on a worker thread and post the results to Tk."""
+        results = {}
         try:
-            import sounddevice
-            import vosk
-            status_messages.append("✓ Voice recognition available")
-        except ImportError:
-            status_messages.append("⚠ Voice recognition - install with: pip install sounddevice vosk")
-        
-        # Display status
-        for message in status_messages:
-            self.status_text.insert(tk.END, message + "\n")
+            key = _environment_key()
+            cached = _load_cached_status(key) if self.use_cache else {}
+            results.update(cached)
+            pending = [(name, probe) for name, probe in STATUS_PROBES if name not in cached]
+            
+            # Probes are independent, so run them concurrently; a probe that raises
+            # reports its own error line instead of aborting the whole check
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+                outcomes = executor.map(lambda item: _run_probe(*item), pending)
+                failed = set()
+                for (name, _), (message, probe_failed) in zip(pending, outcomes):
+                    results[name] = message
+                    if probe_failed:
+                        failed.add(name)
+            
+            fresh = [name for name, _ in pending if name not in LIVE_PROBES and name not in failed]
+            if fresh:
+                _save_cached_status(key, {
+                    name: message for name, message in results.items()
+                    if name not in LIVE_PROBES and name not in failed
+                })
+        finally:
+            # Always replace the placeholder, even if the cache or a probe blew up
+            self.root.after(0, self._render_status, [
+                results.get(name, f"❌ {name}: check failed") for name, _ in STATUS_PROBES
+            ])
+    
+    def _render_status(self, status_messages):
+        """Display dependency check results in a single widget update.
+
+        The label always holds one line per probe, so the placeholder and the
+        results share the same row layout and the pane doesn't resize.
+        """
+        lines = list(status_messages)
+        lines += [""] * (len(STATUS_PROBES) - len(lines))
+        self.status_label.config(text="\n".join(lines))
+    
+    def _entry_point(self):
+        """Pick the script that starts the web/CLI interfaces."""
+        if "start.py" in self._files:
+            return "start.py"
+        if "main.py" in self._files:
+            return "main.py"
+        return None
+    
+    def _launch(self, checks, argv, label, replace=False, **popen_kwargs):
+        """Validate preconditions and spawn an interface on a worker thread.
+        
+        Each check is a (predicate, title, message) tuple; the first failing
+        one is reported in an error dialog. On success the launcher closes,
+        or with replace=True on POSIX, the launcher process becomes the interface.
+        """
+        def worker():
+            try:
+                for predicate, title, message in checks:
+                    if not predicate():
+                        self.root.after(0, messagebox.showerror, title, message)
+                        return
+                
+                if replace and os.name != 'nt':
+                    self.root.after(0, self._replace_with, argv)
+                    return
+                
+                subprocess.Popen(argv, **popen_kwargs)
+                self.root.after(0, self.root.quit)
+                
+            except Exception as e:
+                self.root.after(0, messagebox.showerror, "Launch Error", f"Failed to launch {label}:\n{str(e)}")
         
-        self.status_text.config(state=tk.DISABLED)
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _replace_with(self, argv):
+        """Tear down Tk and replace this process with the given command."""
+        self.root.destroy()
+        sys.stdout.flush()
+        os.execv(argv[0], argv)
     
     def launch_desktop_app(self):
         """Launch the native Windows desktop application."""
-        try:
-            # Check if windows_app.py exists
-            if not Path("windows_app.py").exists():
-                messagebox.showerror(
-                    "File Not Found",
-                    "windows_app.py not found in current directory.\nPlease ensure all files are present."
-                )
-                return
-            
-            # Launch the Windows desktop app
-            subprocess.Popen([sys.executable, "windows_app.py"])
-            self.root.quit()
-            
-        except Exception as e:
-            messagebox.showerror("Launch Error", f"Failed to launch desktop app:\n{str(e)}")
+        self._launch(
+            [(lambda: "windows_app.py" in self._files, "File Not Found",
+              "windows_app.py not found in current directory.\nPlease ensure all files are present.")],
+            [sys.executable, "windows_app.py"],
+            "desktop app",
+            replace=True
+        )
     
     def launch_web_app(self):
         """Launch the Streamlit web interface."""
-        try:
-            # Check if streamlit is available
-            try:
-                import streamlit
-            except ImportError:
-                messagebox.showerror(
-                    "Streamlit Not Found",
-                    "Streamlit is required for web interface.\nInstall with: pip install streamlit"
-                )
-                return
-            
-            # Check if main.py or start.py exists
-            if Path("start.py").exists():
-                subprocess.Popen([sys.executable, "start.py"])
-            elif Path("main.py").exists():
-                subprocess.Popen([sys.executable, "main.py"])
-            else:
-                messagebox.showerror(
-                    "File Not Found",
-                    "Neither start.py nor main.py found.\nPlease ensure all files are present."
-                )
-                return
-            
-            self.root.quit()
-            
-        except Exception as e:
-            messagebox.showerror("Launch Error", f"Failed to launch web app:\n{str(e)}")
+        entry = self._entry_point()
+        self._launch(
+            [(lambda: _present("streamlit"), "Streamlit Not Found",
+              "Streamlit is required for web interface.\nInstall with: pip install streamlit"),
+             (lambda: entry is not None, "File Not Found",
+              "Neither start.py nor main.py found.\nPlease ensure all files are present.")],
+            [sys.executable, entry],
+            "web app",
+            replace=True
+        )
     
     def launch_cli(self):
         """Launch the command line interface."""
-        try:
-            # Launch CLI in a new command prompt window
-            if os.name == 'nt':  # Windows
-                if Path("start.py").exists():
-                    subprocess.Popen(['cmd', '/c', 'start', 'cmd', '/k', f'python start.py --simulate "help"'])
-                elif Path("main.py").exists():
-                    subprocess.Popen(['cmd', '/c', 'start', 'cmd', '/k', f'python main.py --simulate "help"'])
-                else:
-                    messagebox.showerror("File Not Found", "No suitable entry point found for CLI mode.")
-                    return
-            else:
-                # For other platforms
-                subprocess.Popen([sys.executable, "start.py", "--simulate", "help"])
-            
-            self.root.quit()
-            
-        except Exception as e:
-            messagebox.showerror("Launch Error", f"Failed to launch CLI:\n{str(e)}")
+        entry = self._entry_point()
+        checks = [(lambda: entry is not None, "File Not Found", "No suitable entry point found for CLI mode.")]
+        args = [sys.executable, entry, "--simulate", "help"]
+        
+        # Launch CLI in a new command prompt window
+        if os.name == 'nt':  # Windows
+            # cmd /k keeps the console open after the help output
+            self._launch(checks, ['cmd', '/k', *args], "CLI", creationflags=subprocess.CREATE_NEW_CONSOLE)
+        else:
+            # For other platforms
+            self._launch(checks, args, "CLI")
     
     def show_documentation(self):
         """Show documentation options."""
@@ -298,7 +465,7 @@ class LauncherWindow:
         frame = ttk.Frame(doc_window, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
         
-        ttk.Label(frame, text="📖 Documentation", font=('Segoe UI', 14, 'bold')).pack(pady=(0, 20))
+        ttk.Label(frame, text="📖 Documentation", style='Dialog.TLabel').pack(pady=(0, 20))
         
         # Available documentation
         docs = [
@@ -311,7 +478,7 @@ class LauncherWindow:
             doc_frame = ttk.Frame(frame)
             doc_frame.pack(fill=tk.X, pady=5)
             
-            if Path(doc_file).exists():
+            if doc_file in self._files:
                 btn = ttk.Button(
                     doc_frame,
                     text=f"📄 {doc_file}",
@@ -349,7 +516,7 @@ class LauncherWindow:
         frame = ttk.Frame(settings_window, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
         
-        ttk.Label(frame, text="⚙️ Settings", font=('Segoe UI', 14, 'bold')).pack(pady=(0, 20))
+        ttk.Label(frame, text="⚙️ Settings", style='Dialog.TLabel').pack(pady=(0, 20))
         
         ttk.Label(frame, text="Configuration is handled within each interface.", 
                  foreground="gray").pack(pady=10)
@@ -373,10 +540,41 @@ class LauncherWindow:
             self.root.quit()
 
 
+def _exec(target, args, new_console=False):
+    """Hand the process over to an interface script without starting the Tk launcher."""
+    if not Path(target).exists():
+        print(f"❌ {target} not found in current directory")
+        sys.exit(1)
+    
+    argv = [sys.executable, target, *args]
+    if os.name == 'nt':
+        # No exec semantics on Windows: start the interface and exit
+        flags = subprocess.CREATE_NEW_CONSOLE if new_console else 0
+        subprocess.Popen(argv, creationflags=flags)
+        sys.exit(0)
+    
+    sys.stdout.flush()
+    os.execv(sys.executable, argv)
+
+
 def main():
     """Main entry point for the launcher."""
+    parser = argparse.ArgumentParser(description="Agent Desktop AI Extended - Launcher")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check dependencies instead of using cached results")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--desktop", dest="mode", action="store_const", const="desktop", help="Start the desktop app directly")
+    mode.add_argument("--web", dest="mode", action="store_const", const="web", help="Start the web interface directly")
+    mode.add_argument("--cli", dest="mode", action="store_const", const="cli", help="Start the command line interface directly")
+    args, rest = parser.parse_known_args()
+    
+    if args.mode:
+        target, default_args = MODE_TARGETS[args.mode]
+        _exec(target, rest or default_args, new_console=args.mode == "cli")
+    elif rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    
     try:
-        launcher = LauncherWindow()
+        launcher = LauncherWindow(use_cache=not args.no_cache)
         launcher.run()
     except Exception as e:
         # Fallback if GUI fails
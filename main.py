@@ -6,10 +6,12 @@ A local, offline, multilingual voice-controlled personal assistant with strict s
 
 import argparse
 import asyncio
+import concurrent.futures
 import sys
 import os
 import json
 import platform
+import threading
 from pathlib import Path
 
 import streamlit as st
@@ -20,124 +22,195 @@ sys.path.append(str(Path(__file__).parent))
 
 from core.llm_client import OllamaClient
 from core.intent_parser import IntentParser
+from core.intent_batcher import IntentBatcher
 from core.task_router import TaskRouter
 from core.safety import SafetyManager, CapabilityManager
+from utils.logger import HistoryLogger
 try:
-    from mic_input.listen import VoiceRecorder
+    import orjson
+
+    def dumps_result(result):
+        """Pretty-print a result as JSON."""
+        return orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
 except ImportError:
-    # Fallback when voice dependencies are not available
-    class VoiceRecorder:
-        def __init__(self):
-            pass
-        def is_available(self):
-            return False
-        async def record_audio(self):
-            return None
-        async def transcribe(self, audio_file):
-            return None
-from utils.logger import HistoryLogger
+    def dumps_result(result):
+        """Pretty-print a result as JSON."""
+        return json.dumps(result, indent=2, default=str)
+
+# Fixed for the life of the process; read once instead of on every rerun
+OS_NAME = platform.system()
+PYTHON_VERSION = platform.python_version()
+
+# Pre-rendered volume meters, indexed by bar count (0-20)
+VOLUME_BARS = ["`" + ("█" * i).ljust(20) + "`" for i in range(21)]
+
+class UnavailableVoiceRecorder:
+    """Fallback when voice dependencies are not available."""
+    def is_available(self):
+        return False
+    async def record_audio(self, **kwargs):
+        return None
+    async def transcribe(self, audio_file):
+        return None
+    async def record_and_transcribe_live(self, **kwargs):
+        return False, None
+
+def load_voice_recorder():
+    """Import and build the voice recorder; deferred because it loads the Vosk model."""
+    try:
+        from mic_input.listen import VoiceRecorder
+    except ImportError:
+        return UnavailableVoiceRecorder()
+    return VoiceRecorder()
 
 class AgentDesktopAI:
     """Main application class for the AI assistant."""
     
-    def __init__(self, dry_run=True):
+    def __init__(self, dry_run=True, llm_client=None, voice_recorder_factory=load_voice_recorder,
+                 safety_manager=None, capability_manager=None):
         self.dry_run = dry_run
         self.logger = HistoryLogger()
-        self.safety_manager = SafetyManager()
-        self.capability_manager = CapabilityManager()
-        self.llm_client = OllamaClient()
+        self.safety_manager = safety_manager or SafetyManager()
+        self.capability_manager = capability_manager or CapabilityManager()
+        self.llm_client = llm_client or OllamaClient()
         self.intent_parser = IntentParser(self.llm_client)
+        self.intent_batcher = IntentBatcher(self.intent_parser)
         self.task_router = TaskRouter(self.safety_manager, self.capability_manager, dry_run=dry_run)
-        self.voice_recorder = VoiceRecorder()
+        self._voice_recorder_factory = voice_recorder_factory
+        self._voice_recorder = None
+    
+    @property
+    def voice_recorder(self):
+        """Voice recorder, created on first use so text-only runs never load it."""
+        if self._voice_recorder is None:
+            self._voice_recorder = self._voice_recorder_factory()
+        return self._voice_recorder
+    
+    def set_dry_run(self, dry_run):
+        """Switch between simulated and live execution without rebuilding the agent."""
+        self.dry_run = dry_run
+        self.task_router.dry_run = dry_run
+    
+    def start_speculation(self):
+        """Return a speculative-parse record and the on_partial hook that fills it."""
+        speculative = {}
+        def on_partial(text):
+            previous = speculative.get("task")
+            if previous is not None:
+                previous.cancel()
+            speculative["text"] = text
+            speculative["task"] = asyncio.create_task(self.intent_batcher.submit(text))
+        return speculative, on_partial
+    
+    async def parse_intent(self, text, speculative=None):
+        """Parse text, reusing a speculative parse started on the same transcript."""
+        task = speculative.get("task") if speculative else None
+        if task is not None:
+            if speculative["text"] == text:
+                return await task
+            task.cancel()
+        return await self.intent_batcher.submit(text)
         
     async def process_voice_command(self):
         """Process a voice command through the full pipeline."""
+        # One collapsible status box whose label tracks the pipeline stage
+        status = st.status("🎤 Recording... Speak now!", expanded=True)
         try:
             # Record audio with live waveform
-            st.info("🎤 Recording... Speak now!")
-            volume_placeholder = st.empty()
-            last_volume = {"v": 0.0}
+            volume_placeholder = status.empty()
+            loop = asyncio.get_running_loop()
+            # Holds only the latest level; bursts from the audio thread coalesce
+            volume_queue = asyncio.Queue(maxsize=1)
+
+            def offer_volume(v: float):
+                if volume_queue.empty():
+                    volume_queue.put_nowait(v)
+
             def on_volume(v: float):
-                # Only store value from background audio thread
+                # Called from the audio thread; hand the level over to the loop
                 try:
-                    last_volume["v"] = float(v)
-                except Exception:
+                    loop.call_soon_threadsafe(offer_volume, float(v))
+                except (RuntimeError, TypeError, ValueError):
                     pass
 
-            # Start recording task
-            record_task = asyncio.create_task(self.voice_recorder.record_audio(on_volume=on_volume))
-            # UI update loop while recording
+            # Start recording; Vosk transcribes captured blocks while recording continues
+            # and each finished phrase starts an intent parse ahead of the final text
+            speculative, on_partial = self.start_speculation()
+            record_task = asyncio.create_task(self.voice_recorder.record_and_transcribe_live(
+                on_volume=on_volume, on_partial=on_partial
+            ))
+            # Redraw the meter only when a new level arrives
+            last_bars = -1
             while not record_task.done():
-                level = max(0.0, min(1.0, last_volume["v"]))
-                bars = int(level * 20)
-                volume_placeholder.markdown("`" + ("█" * bars).ljust(20) + "`")
-                await asyncio.sleep(0.1)
+                try:
+                    level = await asyncio.wait_for(volume_queue.get(), timeout=0.2)
+                except asyncio.TimeoutError:
+                    continue
+                bars = int(max(0.0, min(1.0, level)) * 20)
+                if bars != last_bars:
+                    volume_placeholder.markdown(VOLUME_BARS[bars])
+                    last_bars = bars
 
-            audio_file = await record_task
+            status.update(label="🗣️ Transcribing...")
+            recorded, transcription = await record_task
             
-            if not audio_file:
-                st.error("Failed to record audio")
+            if not recorded:
+                status.update(label="Failed to record audio", state="error")
                 return None
-                
-            # Transcribe
-            st.info("🗣️ Transcribing...")
-            transcription = await self.voice_recorder.transcribe(audio_file)
             
             if not transcription:
-                st.error("Failed to transcribe audio")
+                status.update(label="Failed to transcribe audio", state="error")
                 return None
                 
             volume_placeholder.empty()
-            st.success(f"Heard: {transcription}")
             # Add user's transcribed speech to chat history
             if 'messages' in st.session_state:
                 st.session_state.messages.append({"role": "user", "content": transcription})
             
             # Parse intent
-            st.info("🧠 Understanding intent...")
-            intent = await self.intent_parser.parse(transcription)
+            status.update(label="🧠 Understanding intent...")
+            intent = await self.parse_intent(transcription, speculative)
             
             if not intent:
-                st.error("Failed to understand intent")
+                status.update(label="Failed to understand intent", state="error")
                 return None
                 
-            # Optionally show intent for debugging
-            with st.expander("Parsed intent"):
-                st.json(intent)
+            # Show the parsed intent in the status log for debugging
+            status.json(intent)
             
             # Execute task
-            st.info("⚡ Executing task...")
+            status.update(label="⚡ Executing task...")
             result = await self.task_router.execute(intent)
             
+            status.update(label=f"Heard: {transcription}", state="complete", expanded=False)
+            
             # Log everything
             self.logger.log_interaction(transcription, intent, result)
 
             # Add assistant response to chat
-            assistant_text = result.get("message", "Task processed") if isinstance(result, dict) else str(result)
             if 'messages' in st.session_state:
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": assistant_text,
-                    "result": result
-                })
+                st.session_state.messages.append(assistant_message(result))
 
             return result
             
         except Exception as e:
             error_msg = f"Error processing voice command: {str(e)}"
-            st.error(error_msg)
+            status.update(label=error_msg, state="error")
             self.logger.log_error(error_msg)
             return None
     
-    async def process_text_command(self, text):
-        """Process a text command through the pipeline."""
+    async def process_text_command(self, text, speculative=None):
+        """Process a text command through the pipeline.
+
+        Runs on the background loop thread, which has no Streamlit script
+        context, so failures come back as results instead of st.* calls.
+        """
         try:
             # Parse intent
-            intent = await self.intent_parser.parse(text)
+            intent = await self.parse_intent(text, speculative)
             
             if not intent:
-                st.error("Failed to understand intent")
-                return None
+                return {"success": False, "message": "Failed to understand intent"}
                 
             # Execute task
             result = await self.task_router.execute(intent)
@@ -149,9 +222,92 @@ class AgentDesktopAI:
             
         except Exception as e:
             error_msg = f"Error processing text command: {str(e)}"
-            st.error(error_msg)
             self.logger.log_error(error_msg)
-            return None
+            return {"success": False, "message": error_msg}
+
+def assistant_message(result):
+    """Build a chat entry for a result, serializing its details once up front."""
+    content = result.get("message", "Task processed") if isinstance(result, dict) else str(result)
+    return {
+        "role": "assistant",
+        "content": content,
+        "result": result,
+        "result_json": dumps_result(result)
+    }
+
+# Stateless heavy components are shared across reruns and sessions. The
+# agent and its safety/capability managers hold per-user settings (dry run,
+# consents, capability toggles), so they live in session state instead, as
+# does the voice recorder: its KaldiRecognizer is stateful, while the Vosk
+# model behind it is already shared by mic_input.listen's model cache.
+@st.cache_resource
+def get_llm_client():
+    return OllamaClient()
+
+@st.cache_resource
+def get_event_loop():
+    """Long-lived loop on a daemon thread so HTTP connections survive between commands."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True).start()
+    return loop
+
+def submit_async(coro):
+    """Schedule a coroutine on the shared loop and return its concurrent future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+@st.cache_resource
+def warm_up_llm():
+    """Start loading the model once per server, without waiting for it."""
+    return submit_async(get_llm_client().warmup())
+
+async def new_event():
+    """Create an asyncio.Event bound to the running loop."""
+    return asyncio.Event()
+
+# (label, command) for the Quick Actions buttons
+QUICK_ACTIONS = [
+    ("🕐 Current Time", "What time is it?"),
+    ("💻 System Status", "Show system status"),
+    ("📁 List Files", "List files in current directory"),
+]
+QUICK_ACTION_TIMEOUT = 30
+
+# (capability, label, default) for the sidebar toggles
+CAPABILITY_TOGGLES = [
+    ("fs", "📁 File System", False),
+    ("process_control", "💻 Process Control", False),
+    ("window_control", "🪟 Window Control", True),
+    ("browser_control", "🌐 Browser Control", True),
+    ("run_shell", "⚠️ Shell Commands", False),
+]
+
+def persist_capability(name):
+    """Save a single capability when its checkbox changes."""
+    st.session_state.agent.capability_manager.update_capabilities({name: st.session_state[f"cap_{name}"]})
+
+# Refresh interval for the recording meter; 5 updates/s is plenty for a level bar
+METER_REFRESH_SECONDS = 0.2
+
+@st.fragment(run_every=METER_REFRESH_SECONDS)
+def recording_meter():
+    """Live volume bar with Stop and Cancel; only this fragment reruns while recording."""
+    rec = st.session_state.rec
+    if not rec["running"]:
+        # The pipeline finished; rerun the whole page to show the new messages
+        st.rerun()
+    vol = max(0.0, min(1.0, rec["volume"]))
+    bars = int(vol * 20)
+    st.markdown(VOLUME_BARS[bars])
+    # Stop ends recording and processes what was said
+    if st.button("⏹ Stop", use_container_width=True):
+        stop_event = rec["stop_event"]
+        if stop_event is not None:
+            get_event_loop().call_soon_threadsafe(stop_event.set)
+    # Cancel abandons the command, skipping transcription and execution
+    if st.button("✖ Cancel", use_container_width=True):
+        future = rec["future"]
+        if future is not None:
+            future.cancel()
 
 def run_streamlit_gui():
     """Run the Streamlit GUI interface."""
@@ -167,7 +323,16 @@ def run_streamlit_gui():
     
     # Initialize session state
     if 'agent' not in st.session_state:
-        st.session_state.agent = AgentDesktopAI(dry_run=True)
+        # Built once per session, so one browser's toggles never reach another's
+        st.session_state.agent = AgentDesktopAI(
+            dry_run=True,
+            llm_client=get_llm_client(),
+            voice_recorder_factory=load_voice_recorder,
+            safety_manager=SafetyManager(),
+            capability_manager=CapabilityManager()
+        )
+    # Hide the model load behind page setup instead of the first command
+    warm_up_llm()
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     
@@ -178,33 +343,22 @@ def run_streamlit_gui():
         # Safety mode toggle
         dry_run_mode = st.checkbox("🛡️ Dry Run Mode (Safe)", value=True, help="When enabled, actions are simulated but not executed")
         if dry_run_mode != st.session_state.agent.dry_run:
-            st.session_state.agent = AgentDesktopAI(dry_run=dry_run_mode)
+            st.session_state.agent.set_dry_run(dry_run_mode)
         
         # Capabilities
         st.header("🔧 Capabilities")
         capabilities = st.session_state.agent.capability_manager.get_capabilities()
         
-        fs_enabled = st.checkbox("📁 File System", value=capabilities.get("fs", False))
-        process_enabled = st.checkbox("💻 Process Control", value=capabilities.get("process_control", False))
-        window_enabled = st.checkbox("🪟 Window Control", value=capabilities.get("window_control", True))
-        browser_enabled = st.checkbox("🌐 Browser Control", value=capabilities.get("browser_control", True))
-        shell_enabled = st.checkbox("⚠️ Shell Commands", value=capabilities.get("run_shell", False))
-        
-        new_capabilities = {
-            "fs": fs_enabled,
-            "process_control": process_enabled,
-            "window_control": window_enabled,
-            "browser_control": browser_enabled,
-            "run_shell": shell_enabled
-        }
-        
-        if new_capabilities != capabilities:
-            st.session_state.agent.capability_manager.update_capabilities(new_capabilities)
+        # Widget state lives under cap_* keys; the file is only written when a box is toggled
+        for name, label, default in CAPABILITY_TOGGLES:
+            st.checkbox(label, value=capabilities.get(name, default), key=f"cap_{name}",
+                        on_change=persist_capability, args=(name,))
+        shell_enabled = st.session_state.cap_run_shell
         
         # System info
         st.header("📊 System Info")
-        st.text(f"OS: {platform.system()}")
-        st.text(f"Python: {platform.python_version()}")
+        st.text(f"OS: {OS_NAME}")
+        st.text(f"Python: {PYTHON_VERSION}")
         
         # Clear history
         if st.button("🗑️ Clear History"):
@@ -218,9 +372,9 @@ def run_streamlit_gui():
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.write(message["content"])
-            if "result" in message:
+            if "result_json" in message:
                 with st.expander("Result Details"):
-                    st.json(message["result"])
+                    st.code(message["result_json"], language="json")
     
     # Text input (must be outside columns)
     if prompt := st.chat_input("Type your command here..."):
@@ -229,23 +383,19 @@ def run_streamlit_gui():
         
         # Process command
         with st.chat_message("assistant"):
-            with st.spinner("Processing..."):
-                result = asyncio.run(st.session_state.agent.process_text_command(prompt))
+            status = st.status("Processing...")
+            result = submit_async(st.session_state.agent.process_text_command(prompt)).result()
+            # process_text_command always returns a result dict; failures carry success=False
+            succeeded = result.get("success", False)
+            status.update(label="Done" if succeeded else "Failed", state="complete" if succeeded else "error")
             
-            if result:
-                if result.get("success"):
-                    st.success(result.get("message", "Task completed successfully"))
-                else:
-                    st.error(result.get("message", "Task failed"))
-                
-                # Add assistant response
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": result.get("message", "Task processed"),
-                    "result": result
-                })
+            if succeeded:
+                st.success(result.get("message", "Task completed successfully"))
             else:
-                st.error("Failed to process command")
+                st.error(result.get("message", "Task failed"))
+            
+            # Add assistant response
+            st.session_state.messages.append(assistant_message(result))
     
     # Action buttons and controls
     col1, col2 = st.columns([3, 1])
@@ -254,77 +404,60 @@ def run_streamlit_gui():
         # Voice input
         st.header("🎤 Voice")
         
-        if 'rec_running' not in st.session_state:
-            st.session_state.rec_running = False
-        if 'rec_stop_event' not in st.session_state:
-            st.session_state.rec_stop_event = None
-        if 'rec_volume' not in st.session_state:
-            st.session_state.rec_volume = 0.0
-
-        if not st.session_state.rec_running:
+        if 'rec' not in st.session_state:
+            # Shared with the pipeline on the background loop, which has no
+            # script context and so cannot reach st.session_state itself
+            st.session_state.rec = {"running": False, "volume": 0.0, "stop_event": None, "future": None}
+        rec = st.session_state.rec
+
+        if not rec["running"]:
             if st.button("🎙️ Record Voice Command", use_container_width=True):
-                # Start async recording pipeline with a stop event
-                # Use a simple flag object because Streamlit may not have a running event loop here
-                class _Stop:
-                    def __init__(self):
-                        self._flag = False
-                    def set(self):
-                        self._flag = True
-                    def is_set(self):
-                        return self._flag
-                st.session_state.rec_stop_event = _Stop()
-                st.session_state.rec_running = True
-
-                async def on_volume(v: float):
-                    st.session_state.rec_volume = float(v)
+                agent = st.session_state.agent
+                # First use loads the recorder; do it here rather than on the loop thread
+                recorder = agent.voice_recorder
+                messages = st.session_state.messages
+                # The event must be created on the loop that will wait on it
+                rec.update(running=True, volume=0.0, stop_event=submit_async(new_event()).result())
 
                 async def pipeline():
-                    # Run recording with stop event and live volume updates
-                    audio = await st.session_state.agent.voice_recorder.record_audio(
-                        duration=60,
-                        on_volume=lambda v: st.session_state.__setitem__('rec_volume', float(v)),
-                        stop_event=st.session_state.rec_stop_event
-                    )
-                    if audio:
-                        tx = await st.session_state.agent.voice_recorder.transcribe(audio)
-                        if tx:
-                            st.session_state.messages.append({"role": "user", "content": tx})
-                            res = await st.session_state.agent.process_text_command(tx)
-                            msg = res.get("message", "Task processed") if isinstance(res, dict) else str(res)
-                            st.session_state.messages.append({"role": "assistant", "content": msg, "result": res})
-                    st.session_state.rec_running = False
-                    st.session_state.rec_volume = 0.0
-                    st.session_state.rec_stop_event = None
-
-                # Run the async pipeline from a fresh event loop in a background thread
-                import threading
-                def _runner():
-                    import asyncio as _a
-                    _a.run(pipeline())
-                threading.Thread(target=_runner, daemon=True).start()
+                    try:
+                        # Run recording with stop event and live volume updates
+                        speculative, on_partial = agent.start_speculation()
+                        recorded, tx = await recorder.record_and_transcribe_live(
+                            duration=60,
+                            on_volume=lambda v: rec.__setitem__("volume", float(v)),
+                            stop_event=rec["stop_event"],
+                            on_partial=on_partial
+                        )
+                        if recorded and tx:
+                            messages.append({"role": "user", "content": tx})
+                            res = await agent.process_text_command(tx, speculative)
+                            messages.append(assistant_message(res))
+                    finally:
+                        rec.update(running=False, volume=0.0, stop_event=None, future=None)
+
+                # Run the pipeline on the shared background loop
+                rec["future"] = submit_async(pipeline())
                 st.rerun()
         else:
-            # Show live volume and a Stop button
-            vol = max(0.0, min(1.0, st.session_state.rec_volume))
-            bars = int(vol * 20)
-            st.markdown("`" + ("█" * bars).ljust(20) + "`")
-            if st.button("⏹ Stop", use_container_width=True):
-                if st.session_state.rec_stop_event is not None:
-                    st.session_state.rec_stop_event.set()
-            # keep UI refreshing while recording
-            st.experimental_rerun()
+            recording_meter()
         
         # Quick actions
         st.header("⚡ Quick Actions")
         
-        if st.button("🕐 Current Time", use_container_width=True):
-            result = asyncio.run(st.session_state.agent.process_text_command("What time is it?"))
-        
-        if st.button("💻 System Status", use_container_width=True):
-            result = asyncio.run(st.session_state.agent.process_text_command("Show system status"))
-        
-        if st.button("📁 List Files", use_container_width=True):
-            result = asyncio.run(st.session_state.agent.process_text_command("List files in current directory"))
+        for label, command in QUICK_ACTIONS:
+            if st.button(label, use_container_width=True):
+                future = submit_async(st.session_state.agent.process_text_command(command))
+                try:
+                    result = future.result(timeout=QUICK_ACTION_TIMEOUT)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    st.error("Timed out waiting for the assistant")
+                else:
+                    if result.get("success"):
+                        st.success(result.get("message", "Task completed successfully"))
+                    else:
+                        st.error(result.get("message", "Task failed"))
         
         # Safety warnings
         st.header("⚠️ Safety")
@@ -369,38 +502,49 @@ def run_cli():
         agent.capability_manager.update_capabilities(capabilities)
         print(f"Enabled modules: {args.enable_module}")
     
-    # Handle simulation mode
-    if args.simulate:
-        print(f"Simulating command: {args.simulate}")
-        result = asyncio.run(agent.process_text_command(args.simulate))
-        if result:
-            print("Result:", json.dumps(result, indent=2))
-        return
-    
-    print("Agent Desktop AI Extended - CLI Mode")
-    print("Type 'quit' to exit, 'voice' for voice input")
-    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE EXECUTION'}")
-    
-    while True:
-        try:
-            command = input("\n> ")
-            
-            if command.lower() == "quit":
-                break
-            elif command.lower() == "voice":
-                print("Voice recording not implemented in CLI mode. Use GUI mode instead.")
-                continue
-            elif not command.strip():
-                continue
-            
-            result = asyncio.run(agent.process_text_command(command))
+    # One loop for the whole session so the Ollama connection pool is reused
+    loop = asyncio.new_event_loop()
+    try:
+        # Handle simulation mode
+        if args.simulate:
+            print(f"Simulating command: {args.simulate}")
+            result = loop.run_until_complete(agent.process_text_command(args.simulate))
             if result:
-                print("Result:", json.dumps(result, indent=2))
+                print("Result:", dumps_result(result))
+            return
+        
+        print("Agent Desktop AI Extended - CLI Mode")
+        print("Type 'quit' to exit, 'voice' for voice input")
+        print(f"Mode: {'DRY RUN' if dry_run else 'LIVE EXECUTION'}")
+        
+        while True:
+            try:
+                command = input("\n> ")
                 
-        except KeyboardInterrupt:
-            break
-        except Exception as e:
-            print(f"Error: {e}")
+                if command.lower() == "quit":
+                    break
+                elif command.lower() == "voice":
+                    print("Voice recording not implemented in CLI mode. Use GUI mode instead.")
+                    continue
+                elif not command.strip():
+                    continue
+                
+                result = loop.run_until_complete(agent.process_text_command(command))
+                if result:
+                    print("Result:", dumps_result(result))
+                    
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                print(f"Error: {e}")
+    finally:
+        # Stop background tasks such as the intent batcher before closing
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(agent.llm_client.aclose())
+        loop.close()
 
 if __name__ == "__main__":
     # Check if we should run Streamlit GUI or CLI
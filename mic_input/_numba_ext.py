@@ -0,0 +1,32 @@
+"""
+Optional Numba kernels for the recorder's silence detection
+Falls back to NumPy when Numba is not installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def sum_squares(buf, start, end):
+        """Sum of squares of buf[start:end]."""
+        total = 0.0
+        for i in range(start, end):
+            sample = float(buf[i])
+            total += sample * sample
+        return total
+else:
+    def sum_squares(buf, start, end):
+        """Sum of squares of buf[start:end]."""
+        # One BLAS dot, no squared temporary; int16 is widened first so it can't overflow
+        block = buf[start:end].astype(np.float32, copy=False)
+        return float(np.dot(block, block))
+
+def warm_up():
+    """Compile the kernel now so the first recording doesn't pay for it."""
+    for dtype in (np.int16, np.float32):
+        sum_squares(np.zeros(16, dtype=dtype), 0, 16)
@@ -4,31 +4,146 @@ Supports multilingual offline speech recognition
 """
 
 import asyncio
+import functools
 import json
 import logging
+import math
+import mmap
 import os
+import queue
+import struct
 import wave
 import time
+from importlib.util import find_spec
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
 
-import sounddevice as sd
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _sd():
+    """Import sounddevice on first use; loading PortAudio is wasted work until the mic is used."""
+    import sounddevice
+    return sounddevice
+
+@functools.lru_cache(maxsize=None)
+def _kernels():
+    """Import and compile the silence-detection kernel on first recording.
+
+    Importing numba takes a few hundred milliseconds, which programs that
+    only import this module shouldn't pay.
+    """
+    from . import _numba_ext
+    _numba_ext.warm_up()
+    return _numba_ext
+
+def _full_scale(dtype) -> float:
+    """Sample value that corresponds to a full-scale (1.0) signal."""
+    return 32767.0 if np.dtype(dtype) == np.int16 else 1.0
+
+def _to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """Convert samples to 16-bit PCM in one pass, without a float temporary."""
+    if samples.dtype == np.int16:
+        return samples
+    pcm = np.empty(samples.shape, dtype=np.int16)
+    np.multiply(samples, np.float32(32767), out=pcm, casting='unsafe')
+    return pcm
+
+@functools.lru_cache(maxsize=2)
+def _load_vosk_model(model_dir: str):
+    """Load a Vosk model once per process; recorders share it and keep their own recognizers."""
+    import vosk  # type: ignore
+    return vosk.Model(model_dir)
+
+def _wav_data_span(mm: mmap.mmap) -> Tuple[int, int, int]:
+    """Return (sample rate, data offset, data size) by walking a mapped WAV's RIFF chunks."""
+    if mm[:4] != b'RIFF' or mm[8:12] != b'WAVE':
+        raise ValueError("not a WAV file")
+    rate = None
+    pos = 12
+    while pos + 8 <= len(mm):
+        chunk_id, chunk_size = struct.unpack_from('<4sI', mm, pos)
+        pos += 8
+        if chunk_id == b'fmt ':
+            rate = struct.unpack_from('<I', mm, pos + 4)[0]
+        elif chunk_id == b'data':
+            return rate, pos, min(chunk_size, len(mm) - pos)
+        pos += chunk_size + (chunk_size & 1)  # chunks are word aligned
+    raise ValueError("WAV file has no data chunk")
+
+@functools.lru_cache(maxsize=32)
+def _find_model_dir(path: str) -> str:
+    """Descend through single-subdirectory wrappers to the directory holding model files."""
+    if not os.path.isdir(path):
+        return path
+    # DirEntry answers is_file/is_dir from the directory listing, without a stat per file
+    with os.scandir(path) as it:
+        entries = list(it)
+    # If the directory already contains files, assume it is the model dir
+    if any(entry.is_file() for entry in entries):
+        return path
+    # If there is exactly one subdirectory, descend into it
+    subdirs = [entry.path for entry in entries if entry.is_dir()]
+    if len(subdirs) == 1:
+        return _find_model_dir(subdirs[0])
+    return path
+
+def _rms(samples: np.ndarray) -> float:
+    """Root-mean-square level of a block of samples, relative to full scale.
+
+    Uses the same sum-of-squares kernel as the recorder's level metering.
+    """
+    samples = np.ascontiguousarray(samples).ravel()
+    if not samples.size:
+        return 0.0
+    sum_sq = _kernels().sum_squares(samples, 0, samples.size)
+    return math.sqrt(sum_sq / samples.size) / _full_scale(samples.dtype)
+
+class _EnergyWindow:
+    """Running mean square over about the last `size` samples, updated a block at a time."""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.blocks = deque()
+        self.count = 0
+        self.total = 0.0
+    
+    def push(self, count: int, sum_sq: float) -> float:
+        """Add a block's sum of squares and return the window's mean square."""
+        self.blocks.append((count, sum_sq))
+        self.count += count
+        self.total += sum_sq
+        # Retire whole blocks while the rest still covers the window
+        while self.count - self.blocks[0][0] >= self.size:
+            old_count, old_sum = self.blocks.popleft()
+            self.count -= old_count
+            self.total -= old_sum
+        return max(self.total, 0.0) / self.count
+
 class VoiceRecorder:
     """Handles voice recording and offline transcription using Vosk."""
     
     def __init__(self, sample_rate: int = 16000, channels: int = 1, 
-                 vosk_model_path: str = None, save_recordings: bool = True):
+                 vosk_model_path: str = None, save_recordings: bool = True,
+                 dtype: str = 'int16'):
         self.sample_rate = sample_rate
         self.channels = channels
+        # Capture as 16-bit PCM, which is what Vosk and the WAV files take;
+        # 'float32' is still accepted for debugging
+        self.dtype = np.dtype(dtype)
         self.save_recordings = save_recordings
         self.recordings_dir = Path.home() / ".agent_desktop_ai" / "recordings"
         
         if save_recordings:
             self.recordings_dir.mkdir(parents=True, exist_ok=True)
+        self._background_saves = set()
+        # sounddevice itself is imported on first use
+        self.has_audio_backend = find_spec("sounddevice") is not None
+        if not self.has_audio_backend:
+            logger.error("sounddevice not installed. Install with: pip install sounddevice")
         
         # Initialize Vosk
         self.vosk_model = None
@@ -65,7 +180,7 @@ class VoiceRecorder:
             if self.vosk_model_path.exists():
                 effective_model_dir = self._resolve_model_dir(self.vosk_model_path)
                 logger.info(f"Loading Vosk model from: {effective_model_dir}")
-                self.vosk_model = vosk.Model(str(effective_model_dir))
+                self.vosk_model = _load_vosk_model(str(effective_model_dir))
                 self.vosk_rec = vosk.KaldiRecognizer(self.vosk_model, self.sample_rate)
                 logger.info("Vosk model loaded successfully")
             else:
@@ -84,29 +199,21 @@ class VoiceRecorder:
         contains exactly one subdirectory with the model files.
         """
         try:
-            base_path = base_path.resolve()
-            if base_path.is_dir():
-                entries = list(base_path.iterdir())
-                # If the directory already contains files, assume it is the model dir
-                if any(entry.is_file() for entry in entries):
-                    return base_path
-                # If there is exactly one subdirectory, descend into it
-                subdirs = [e for e in entries if e.is_dir()]
-                if len(subdirs) == 1:
-                    return self._resolve_model_dir(subdirs[0])
+            return Path(_find_model_dir(str(base_path.resolve())))
         except Exception as e:
             logger.debug(f"Model directory resolution fallback for {base_path}: {e}")
         return base_path
     
     def is_available(self) -> bool:
         """Check if voice recording is available."""
-        return self.vosk_model is not None and self.vosk_rec is not None
+        return self.has_audio_backend and self.vosk_model is not None and self.vosk_rec is not None
     
     async def record_audio(self, duration: float = 5.0, 
                           silence_threshold: float = 0.01,
                           min_duration: float = 1.0,
                           on_volume: Optional[Callable[[float], None]] = None,
-                          stop_event: Optional[object] = None) -> Optional[str]:
+                          stop_event: Optional[object] = None,
+                          on_chunk: Optional[Callable[[np.ndarray], None]] = None) -> Optional[str]:
         """
         Record audio from microphone with automatic silence detection.
         
@@ -116,150 +223,163 @@ class VoiceRecorder:
             min_duration: Minimum recording duration before silence detection
             on_volume: Optional callback receiving a float volume level (0..1+) for UI updates
             stop_event: Optional asyncio.Event to stop recording early from UI
+            on_chunk: Optional callback receiving each mono block, called from the audio thread;
+                the block is a view into the recording buffer and must not be modified
             
         Returns:
             Path to recorded audio file or None if recording failed
         """
+        captured = await self._capture(duration, silence_threshold, min_duration,
+                                       on_volume, stop_event, on_chunk)
+        if captured is None:
+            return None
+        # Writing can take a while on slow disks; keep volume callbacks on schedule
+        return await asyncio.to_thread(self._save_wav, *captured)
+    
+    async def _capture(self, duration: float, silence_threshold: float, min_duration: float,
+                       on_volume: Optional[Callable[[float], None]],
+                       stop_event: Optional[object],
+                       on_chunk: Optional[Callable[[np.ndarray], None]]) -> Optional[Tuple[np.ndarray, int]]:
+        """Record from the microphone; returns (samples in self.dtype, sample rate) or None."""
         try:
             logger.info(f"Starting audio recording (max {duration}s)")
             
-            # Prepare recording
-            audio_data = []
-            silence_count = 0
-            silence_limit = int(self.sample_rate * 0.5)  # 0.5 seconds of silence
-            min_samples = int(self.sample_rate * min_duration)
+            # Samples go straight into a preallocated buffer; it is sized per
+            # stream because the fallback stream may run at another rate.
+            # Silence is judged in the callback, which sets 'done' to end the stream.
+            loop = asyncio.get_running_loop()
+            # First call imports and compiles the kernel; keep that off the loop
+            sum_squares = (await asyncio.to_thread(_kernels)).sum_squares
+            # Compare energy rather than RMS so the callback needs no sqrt; a
+            # higher bar to count as speech again keeps the counter from
+            # chattering when the level hovers near the threshold
+            full_scale = _full_scale(self.dtype)
+            level = silence_threshold * full_scale
+            silence_sq = level ** 2
+            speech_sq = (level * 1.5) ** 2
+            capture = {'buf': None, 'n': 0, 'silence': 0, 'done': None, 'reason': None}
+            
+            def finish(reason: str):
+                """Signal the waiting coroutine once; called from the audio thread."""
+                if capture['reason'] is None:
+                    capture['reason'] = reason
+                    loop.call_soon_threadsafe(capture['done'].set)
             
             def audio_callback(indata, frames, time, status):
                 """Audio input callback."""
                 if status:
                     logger.warning(f"Audio input status: {status}")
-                # instantaneous volume for UI
-                try:
-                    if on_volume is not None and frames > 0 and indata.shape[0] > 0:
-                        import numpy as _np
-                        chunk = indata[:, 0]
-                        vol = float((_np.sqrt((_np.mean((_np.square(chunk)))))))
-                        on_volume(vol)
-                except Exception:
-                    pass
+                buf = capture['buf']
+                start = capture['n']
+                end = min(start + frames, len(buf))
+                # The slice assignment is the only copy; everything below reads
+                # this contiguous, never-overwritten span of the buffer
+                buf[start:end] = indata[:end - start, 0]
+                capture['n'] = end
+                block = buf[start:end]
+                
+                if block.size:
+                    # One pass over the new block feeds both the UI level and
+                    # the silence window
+                    sum_sq = sum_squares(buf, start, end)
+                    energy = capture['window'].push(block.size, sum_sq)  # Last ~0.1 seconds
+                    # instantaneous volume for UI
+                    try:
+                        if on_volume is not None:
+                            vol = math.sqrt(sum_sq / block.size) / full_scale
+                            on_volume(vol)
+                    except Exception:
+                        pass
+                    
+                    if on_chunk is not None:
+                        on_chunk(block)
                 
-                audio_data.extend(indata[:, 0].copy())
+                if stop_event is not None and stop_event.is_set():
+                    finish("Stop requested, ending recording")
+                elif end >= len(buf):
+                    finish("Recording buffer full")
+                elif block.size and end > capture['min_samples']:
+                    # Check for silence after minimum duration
+                    if energy < silence_sq:
+                        capture['silence'] += frames
+                        if capture['silence'] >= capture['silence_limit']:
+                            finish("Silence detected, stopping recording")
+                    elif energy > speech_sq:
+                        capture['silence'] = 0
             
-            # Start recording
-            try:
-                with sd.InputStream(
-                    samplerate=self.sample_rate,
+            async def capture_stream(rate: int):
+                """Record at the given rate until max duration, silence or stop."""
+                # One second of slack for callbacks that land after the deadline
+                capture.update(
+                    buf=np.empty(int(rate * (duration + 1)), dtype=self.dtype),
+                    n=0, silence=0, done=asyncio.Event(), reason=None,
+                    window=_EnergyWindow(int(rate * 0.1)),
+                    min_samples=int(rate * min_duration),
+                    silence_limit=int(rate * 0.5),  # 0.5 seconds of silence
+                )
+                
+                with _sd().InputStream(
+                    samplerate=rate,
                     channels=self.channels,
                     callback=audio_callback,
-                    dtype=np.float32
+                    dtype=self.dtype.name,
+                    blocksize=int(rate * 0.02),  # 20 ms, so a stop lands within one block
+                    latency='low'
                 ):
-                    start_time = time.time()
-                    
-                    while time.time() - start_time < duration:
-                        if stop_event is not None and stop_event.is_set():
-                            logger.info("Stop requested, ending recording")
-                            break
-                        await asyncio.sleep(0.1)
-                        
-                        # Check for silence after minimum duration
-                        if len(audio_data) > min_samples:
-                            recent_audio = audio_data[-int(self.sample_rate * 0.1):]  # Last 0.1 seconds
-                            if len(recent_audio) > 0:
-                                volume = np.sqrt(np.mean(np.square(recent_audio)))
-                                if on_volume is not None:
-                                    try:
-                                        on_volume(float(volume))
-                                    except Exception:
-                                        pass
-                                
-                                if volume < silence_threshold:
-                                    silence_count += int(self.sample_rate * 0.1)
-                                    if silence_count >= silence_limit:
-                                        logger.info("Silence detected, stopping recording")
-                                        break
-                                else:
-                                    silence_count = 0
+                    try:
+                        await asyncio.wait_for(capture['done'].wait(), timeout=duration)
+                        logger.info(capture['reason'])
+                    except asyncio.TimeoutError:
+                        pass
+            
+            # Start recording
+            rate = self.sample_rate
+            try:
+                await capture_stream(rate)
             except Exception as e:
                 logger.warning(f"Failed to open input stream at {self.sample_rate} Hz: {e}. Retrying with device default rate.")
                 try:
-                    dev_info = sd.query_devices(kind='input')
-                    fallback_sr = int(dev_info.get('default_samplerate') or self.sample_rate)
-                    with sd.InputStream(
-                        samplerate=fallback_sr,
-                        channels=self.channels,
-                        callback=audio_callback,
-                        dtype=np.float32
-                    ):
-                        start_time = time.time()
-                        
-                        while time.time() - start_time < duration:
-                            if stop_event is not None and stop_event.is_set():
-                                logger.info("Stop requested, ending recording")
-                                break
-                            await asyncio.sleep(0.1)
-                            
-                            # Check for silence after minimum duration
-                            if len(audio_data) > int(fallback_sr * min_duration):
-                                recent_audio = audio_data[-int(fallback_sr * 0.1):]
-                                if len(recent_audio) > 0:
-                                    volume = np.sqrt(np.mean(np.square(recent_audio)))
-                                    if on_volume is not None:
-                                        try:
-                                            on_volume(float(volume))
-                                        except Exception:
-                                            pass
-                                    if volume < silence_threshold:
-                                        # 0.1s chunk
-                                        silence_count += int(fallback_sr * 0.1)
-                                        if silence_count >= int(fallback_sr * 0.5):
-                                            logger.info("Silence detected, stopping recording")
-                                            break
-                                    else:
-                                        silence_count = 0
+                    dev_info = _sd().query_devices(kind='input')
+                    rate = int(dev_info.get('default_samplerate') or self.sample_rate)
+                    await capture_stream(rate)
                 except Exception as e2:
                     logger.error(f"Audio recording failed to start: {e2}")
                     return None
             
-            if not audio_data:
+            if not capture['n']:
                 logger.error("No audio data recorded")
                 return None
             
-            # Convert to numpy array and normalize
-            audio_array = np.array(audio_data, dtype=np.float32)
-            
-            # Save audio file
+            # A view of the samples actually captured; no copy
+            return capture['buf'][:capture['n']], rate
+                
+        except Exception as e:
+            logger.error(f"Audio recording failed: {e}")
+            return None
+    
+    def _save_wav(self, audio_array: np.ndarray, rate: int) -> Optional[str]:
+        """Write samples as a 16-bit WAV and return its path."""
+        try:
             if self.save_recordings:
                 timestamp = int(time.time())
                 filename = f"recording_{timestamp}.wav"
-                filepath = self.recordings_dir / filename
-                
-                # Save as WAV file
-                with wave.open(str(filepath), 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(self.sample_rate)
-                    
-                    # Convert float32 to int16
-                    audio_int16 = (audio_array * 32767).astype(np.int16)
-                    wf.writeframes(audio_int16.tobytes())
-                
-                logger.info(f"Audio saved to: {filepath}")
-                return str(filepath)
+                filepath = str(self.recordings_dir / filename)
             else:
-                # Return temporary file path
-                temp_file = "/tmp/temp_recording.wav"
-                with wave.open(temp_file, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)
-                    wf.setframerate(self.sample_rate)
-                    
-                    audio_int16 = (audio_array * 32767).astype(np.int16)
-                    wf.writeframes(audio_int16.tobytes())
-                
-                return temp_file
+                # Temporary file path
+                filepath = "/tmp/temp_recording.wav"
+            
+            with wave.open(filepath, 'wb') as wf:
+                wf.setnchannels(self.channels)
+                wf.setsampwidth(2)  # 16-bit
+                wf.setframerate(rate)
                 
+                wf.writeframes(_to_pcm16(audio_array).tobytes())
+            
+            if self.save_recordings:
+                logger.info(f"Audio saved to: {filepath}")
+            return filepath
         except Exception as e:
-            logger.error(f"Audio recording failed: {e}")
+            logger.error(f"Failed to save recording: {e}")
             return None
     
     async def transcribe(self, audio_file: str) -> Optional[str]:
@@ -279,21 +399,19 @@ class VoiceRecorder:
         try:
             logger.info(f"Transcribing audio file: {audio_file}")
             
-            # Read audio file
-            with wave.open(audio_file, 'rb') as wf:
+            # Map the file and hand Vosk slices of the PCM data directly
+            with open(audio_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                rate, offset, size = _wav_data_span(mm)
                 # Verify audio format
-                if wf.getframerate() != self.sample_rate:
-                    logger.warning(f"Audio sample rate mismatch: {wf.getframerate()} vs {self.sample_rate}")
+                if rate != self.sample_rate:
+                    logger.warning(f"Audio sample rate mismatch: {rate} vs {self.sample_rate}")
                 
-                # Read audio data in chunks
+                # Read audio data in chunks of 4000 16-bit frames
                 results = []
-                
-                while True:
-                    data = wf.readframes(4000)  # Read in chunks
-                    if len(data) == 0:
-                        break
-                    
-                    if self.vosk_rec.AcceptWaveform(data):
+                end = offset + size
+                for start in range(offset, end, 8000):
+                    if self.vosk_rec.AcceptWaveform(mm[start:min(start + 8000, end)]):
                         result = json.loads(self.vosk_rec.Result())
                         if result.get('text'):
                             results.append(result['text'])
@@ -317,17 +435,98 @@ class VoiceRecorder:
             logger.error(f"Transcription failed: {e}")
             return None
     
+    def _transcribe_blocks(self, blocks: queue.Queue,
+                           on_partial: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Feed queued sample blocks to Vosk until a None sentinel arrives; runs on a worker thread."""
+        try:
+            results = []
+            while True:
+                block = blocks.get()
+                if block is None:
+                    break
+                if self.vosk_rec.AcceptWaveform(_to_pcm16(block).tobytes()):
+                    result = json.loads(self.vosk_rec.Result())
+                    if result.get('text'):
+                        results.append(result['text'])
+                        # Vosk only finalizes a segment at a pause, so this prefix is stable
+                        if on_partial is not None:
+                            on_partial(' '.join(results).strip())
+            
+            final_result = json.loads(self.vosk_rec.FinalResult())
+            if final_result.get('text'):
+                results.append(final_result['text'])
+            
+            transcription = ' '.join(results).strip()
+            if transcription:
+                logger.info(f"Transcription: {transcription}")
+                return transcription
+            logger.warning("No speech detected in audio")
+            return None
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            return None
+    
+    async def record_and_transcribe_live(self, on_partial: Optional[Callable[[str], None]] = None,
+                                         duration: float = 5.0,
+                                         silence_threshold: float = 0.01,
+                                         min_duration: float = 1.0,
+                                         on_volume: Optional[Callable[[float], None]] = None,
+                                         stop_event: Optional[object] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Record audio while Vosk transcribes the blocks already captured.
+        
+        Takes the same arguments as record_audio, plus on_partial, which is
+        called on the event loop with the transcript so far each time Vosk
+        finalizes a phrase. Audio never goes through a WAV file; it is only
+        written, in the background, when save_recordings is set.
+        
+        Returns:
+            Tuple of (whether audio was captured, transcription or None)
+        """
+        if not self.is_available():
+            logger.error("Vosk not available for transcription")
+            return False, None
+        
+        loop = asyncio.get_running_loop()
+        # The audio callback hands blocks straight to one recognizer thread,
+        # so nothing round-trips through the event loop per block
+        blocks = queue.Queue()
+        
+        def partial(text: str):
+            try:
+                loop.call_soon_threadsafe(on_partial, text)
+            except RuntimeError:
+                pass
+        
+        worker = loop.run_in_executor(None, self._transcribe_blocks, blocks,
+                                      partial if on_partial is not None else None)
+        try:
+            captured = await self._capture(duration, silence_threshold, min_duration,
+                                           on_volume, stop_event, blocks.put_nowait)
+        finally:
+            # The stream is closed by now, so the sentinel follows the last block
+            blocks.put_nowait(None)
+        transcription = await worker
+        
+        if captured is None:
+            return False, None
+        if self.save_recordings:
+            # Keep a copy on disk without making the caller wait for it; hold a
+            # reference so the task isn't collected before it finishes
+            save = asyncio.create_task(asyncio.to_thread(self._save_wav, *captured))
+            self._background_saves.add(save)
+            save.add_done_callback(self._background_saves.discard)
+        return True, transcription
+    
     async def record_and_transcribe(self, duration: float = 5.0) -> Optional[str]:
         """Record audio and transcribe in one step."""
-        audio_file = await self.record_audio(duration)
-        if audio_file:
-            return await self.transcribe(audio_file)
-        return None
+        _, transcription = await self.record_and_transcribe_live(duration=duration)
+        return transcription
     
     def list_input_devices(self) -> list:
         """List available audio input devices."""
         try:
-            devices = sd.query_devices()
+            devices = _sd().query_devices()
             input_devices = [
                 {
                     'id': i,
@@ -345,7 +544,7 @@ class VoiceRecorder:
     def set_input_device(self, device_id: int):
         """Set the audio input device."""
         try:
-            sd.default.device[0] = device_id  # Set input device
+            _sd().default.device[0] = device_id  # Set input device
             logger.info(f"Set input device to: {device_id}")
         except Exception as e:
             logger.error(f"Failed to set input device: {e}")
@@ -356,16 +555,18 @@ class VoiceRecorder:
             logger.info("Testing microphone...")
             
             # Record a short test
-            test_data = sd.rec(
+            test_data = _sd().rec(
                 int(self.sample_rate * 1),  # 1 second
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.float32
+                dtype=np.float32,
+                blocksize=int(self.sample_rate * 0.02),
+                latency='low'
             )
-            sd.wait()
+            _sd().wait()
             
             # Check if we got audio data
-            volume = np.sqrt(np.mean(np.square(test_data)))
+            volume = _rms(test_data)
             logger.info(f"Microphone test volume: {volume}")
             
             return volume > 0.001  # Some minimal threshold
@@ -429,6 +630,10 @@ class MockVoiceRecorder:
         logger.warning("Using mock voice recorder - no transcription available")
         return "Mock transcription - please install Vosk for real voice recognition"
     
+    async def record_and_transcribe_live(self, **kwargs) -> Tuple[bool, Optional[str]]:
+        logger.warning("Using mock voice recorder - no audio recorded")
+        return False, None
+    
     async def record_and_transcribe(self, duration: float = 5.0) -> Optional[str]:
         return "Mock transcription - please install Vosk"
     
@@ -453,10 +658,9 @@ class MockVoiceRecorder:
 # Factory function to create appropriate voice recorder
 def create_voice_recorder(**kwargs) -> VoiceRecorder:
     """Create a voice recorder instance, falling back to mock if dependencies missing."""
-    try:
-        import vosk
-        import sounddevice as sd
-        return VoiceRecorder(**kwargs)
-    except ImportError as e:
-        logger.warning(f"Voice recording dependencies not available: {e}")
+    # Only check that the packages exist; they are imported when first used
+    missing = [name for name in ("vosk", "sounddevice") if find_spec(name) is None]
+    if missing:
+        logger.warning(f"Voice recording dependencies not available: {', '.join(missing)}")
         return MockVoiceRecorder(**kwargs)
+    return VoiceRecorder(**kwargs)
@@ -7,28 +7,16 @@ Handles missing dependencies gracefully
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+REQUIRED_PACKAGES = ("streamlit", "psutil", "requests")
+
 def check_dependencies():
     """Check if required dependencies are installed."""
-    missing = []
-    
-    try:
-        import streamlit
-    except ImportError:
-        missing.append("streamlit")
-    
-    try:
-        import psutil
-    except ImportError:
-        missing.append("psutil")
-    
-    try:
-        import requests
-    except ImportError:
-        missing.append("requests")
-    
-    return missing
+    # find_spec only locates the package; importing streamlit just to check
+    # for it would pull in its whole dependency tree
+    return [name for name in REQUIRED_PACKAGES if find_spec(name) is None]
 
 def install_dependencies(packages):
     """Install missing dependencies."""
@@ -88,6 +76,13 @@ def main():
             """Check if a port is available."""
             try:
                 with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                    # Streamlit (Tornado) binds with SO_REUSEADDR, so on Linux a port left
+                    # in TIME_WAIT by the previous run is still usable; probe the same way.
+                    # Only Linux: on Windows the option lets bind() succeed on a port another
+                    # socket is listening on, and on macOS/BSD binding localhost succeeds
+                    # while a server listens on the wildcard address.
+                    if sys.platform.startswith("linux"):
+                        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                     s.bind(('localhost', port))
                     return True
             except OSError:
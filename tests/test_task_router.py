@@ -0,0 +1,31 @@
+"""
+Task router results as the desktop app renders them
+"""
+
+import asyncio
+
+from core.safety import SafetyManager, CapabilityManager
+from core.task_router import TaskRouter
+from utils.helpers import format_result_details
+
+
+def test_read_file_result_shows_content(tmp_path, monkeypatch):
+    """A successful read_file keeps its content visible after passthrough."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    config_dir = tmp_path / ".agent_desktop_ai"
+    documents = tmp_path / "Documents"
+    documents.mkdir()
+    note = documents / "note.txt"
+    note.write_text("first line\nsecond line\n")
+
+    capabilities = CapabilityManager(config_dir=config_dir)
+    capabilities.update_capabilities({"fs": True})
+    router = TaskRouter(SafetyManager(config_dir=config_dir), capabilities, dry_run=False)
+
+    intent = {"intent": "read_file", "target": str(note), "options": {}}
+    result = asyncio.run(router.execute(intent))
+
+    assert result["success"]
+    details = format_result_details(result)
+    assert "first line\nsecond line" in details
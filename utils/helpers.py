@@ -2,39 +2,66 @@
 Helper utilities for the Agent Desktop AI Extended
 """
 
+import functools
+import json
 import os
 import platform
+import re
+import socket
 import subprocess
 import sys
+import threading
+import time
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+try:
+    import psutil
+    psutil.cpu_percent(interval=None)  # Start the CPU sampling window
+except ImportError:
+    psutil = None
+
+# The OS can't change while we run
+SYSTEM = platform.system()
+IS_WINDOWS = SYSTEM == "Windows"
+
+# Seconds a get_system_context() snapshot stays fresh
+_CONTEXT_TTL = 2.0
+_context_cache = {'time': 0.0, 'value': None}
+
 def get_system_context() -> Dict[str, Any]:
-    """Get comprehensive system context information."""
+    """Get comprehensive system context information.
+
+    Snapshots are reused for _CONTEXT_TTL seconds so back-to-back callers
+    don't each re-sample the system.
+    """
+    now = time.monotonic()
+    if _context_cache['value'] is not None and now - _context_cache['time'] < _CONTEXT_TTL:
+        return _context_cache['value']
+    
     try:
-        import psutil
+        if psutil is None:
+            raise ImportError("psutil is not installed")
+        
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('C:' if IS_WINDOWS else '/')
         
         context = {
-            'platform': {
-                'system': platform.system(),
-                'platform': platform.platform(),
-                'architecture': platform.architecture(),
-                'machine': platform.machine(),
-                'processor': platform.processor(),
-                'python_version': platform.python_version()
-            },
+            'platform': dict(_platform_info()),
             'resources': {
                 'cpu_count': psutil.cpu_count(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
+                # Usage since the previous call (primed at import) instead of a 1s blocking sample
+                'cpu_percent': psutil.cpu_percent(interval=None),
                 'memory': {
-                    'total': psutil.virtual_memory().total,
-                    'available': psutil.virtual_memory().available,
-                    'percent': psutil.virtual_memory().percent
+                    'total': memory.total,
+                    'available': memory.available,
+                    'percent': memory.percent
                 },
                 'disk': {
-                    'total': psutil.disk_usage('/').total if platform.system() != 'Windows' else psutil.disk_usage('C:').total,
-                    'free': psutil.disk_usage('/').free if platform.system() != 'Windows' else psutil.disk_usage('C:').free,
-                    'percent': psutil.disk_usage('/').percent if platform.system() != 'Windows' else psutil.disk_usage('C:').percent
+                    'total': disk.total,
+                    'free': disk.free,
+                    'percent': disk.percent
                 }
             },
             'environment': {
@@ -51,81 +78,152 @@ def get_system_context() -> Dict[str, Any]:
             }
         }
         
+        _context_cache.update(time=now, value=context)
         return context
         
     except Exception as e:
         return {
             'error': str(e),
             'platform': {
-                'system': platform.system(),
+                'system': SYSTEM,
                 'python_version': platform.python_version()
             }
         }
 
+BROWSER_NAMES = ('chrome', 'firefox', 'safari', 'edge', 'opera', 'brave')
+
+@functools.lru_cache(maxsize=1)
+def _platform_info() -> Dict[str, Any]:
+    """Static platform details; platform.processor() can shell out, so look them up once."""
+    return {
+        'system': SYSTEM,
+        'platform': platform.platform(),
+        'architecture': platform.architecture(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python_version': platform.python_version()
+    }
+
 def get_running_browsers() -> List[str]:
     """Get list of currently running browser processes."""
     try:
-        import psutil
-        
-        browser_names = ['chrome', 'firefox', 'safari', 'edge', 'opera', 'brave']
-        running_browsers = []
+        found = set()
+        for proc_name in _iter_process_names():
+            found.update(browser for browser in BROWSER_NAMES if browser in proc_name)
+            if len(found) == len(BROWSER_NAMES):
+                break
         
-        for proc in psutil.process_iter(['name']):
-            try:
-                proc_name = proc.info['name'].lower()
-                for browser in browser_names:
-                    if browser in proc_name:
-                        if browser not in running_browsers:
-                            running_browsers.append(browser)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-                
-        return running_browsers
+        return [browser for browser in BROWSER_NAMES if browser in found]
         
-    except ImportError:
-        return []
     except Exception:
         return []
 
-def check_dependencies() -> Dict[str, bool]:
-    """Check if required dependencies are available."""
-    dependencies = {
-        'streamlit': False,
-        'psutil': False,
-        'vosk': False,
-        'sounddevice': False,
-        'numpy': False,
-        'pyautogui': False,
-        'pygetwindow': False,
-        'requests': False,
-        'httpx': False
-    }
+def _iter_process_names():
+    """Yield lowercase process names, reading /proc directly on Linux."""
+    if os.path.isdir('/proc/self'):
+        # One small read per process; psutil.process_iter would also build a
+        # Process object and check its create time for each pid
+        with os.scandir('/proc') as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{entry.name}/comm') as f:
+                        yield f.read().strip().lower()
+                except OSError:
+                    continue
+        return
     
-    for dep in dependencies:
+    if psutil is None:
+        return
+    # psutil >= 6.0 no longer checks each pid for reuse here, and calling
+    # name() directly skips the as_dict() wrapper that attrs= goes through
+    for proc in psutil.process_iter():
         try:
-            __import__(dep)
-            dependencies[dep] = True
-        except ImportError:
-            dependencies[dep] = False
-    
-    return dependencies
+            name = proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if name:
+            yield name.lower()
+
+DEPENDENCIES = (
+    'streamlit',
+    'psutil',
+    'vosk',
+    'sounddevice',
+    'numpy',
+    'pyautogui',
+    'pygetwindow',
+    'requests',
+    'httpx'
+)
+
+def check_dependencies() -> Dict[str, bool]:
+    """Check if required dependencies are available."""
+    return dict(_find_dependencies())
+
+@functools.lru_cache(maxsize=1)
+def _find_dependencies():
+    """Look each dependency up once per process, without importing it."""
+    return tuple((dep, find_spec(dep) is not None) for dep in DEPENDENCIES)
+
+SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_names[i]}"
+    # 1024 == 2**10, so the unit index is the bit length in steps of ten
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_NAMES) - 1)
+    s = round(size_bytes / (1 << (10 * i)), 2)
+    return f"{s} {SIZE_NAMES[i]}"
+
+# Fields TaskRouter and the UIs add around a command's own payload
+RESULT_STATUS_KEYS = frozenset({
+    'success', 'message', 'error', 'execution_time', 'timestamp',
+    'intent_type', 'dry_run', 'transcription'
+})
+
+def format_result_details(result: Dict[str, Any], skip=(), max_chars: int = 8192) -> Optional[str]:
+    """Render a command result's payload (content, processes, matches...) as text.
+
+    Results carry their data as top-level keys next to success/message, so
+    everything outside RESULT_STATUS_KEYS and `skip` is shown; multi-line
+    strings such as file contents are shown verbatim. A failed result with
+    nothing else to show falls back to its 'error'.
+    """
+    text_fields = []
+    payload = {}
+    for key, value in result.items():
+        if key in RESULT_STATUS_KEYS or key in skip or key.startswith('_'):
+            continue
+        if value is None or value == '' or value == [] or value == {}:
+            continue
+        if isinstance(value, str) and '\n' in value:
+            text_fields.append(f"{key}:\n{value}")
+        else:
+            payload[key] = value
+
+    sections = []
+    if payload:
+        sections.append(json.dumps(payload, indent=2, default=str))
+    sections.extend(text_fields)
+    if not sections and not result.get('success') and result.get('error'):
+        sections.append(str(result['error']))
+    if not sections:
+        return None
+
+    text = "\n".join(sections)
+    if len(text) > max_chars:
+        text = text[:max_chars] + "\n… (truncated)"
+    return text
 
+@functools.lru_cache(maxsize=1)
 def is_admin() -> bool:
     """Check if running with administrator/root privileges."""
     try:
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             import ctypes
             return ctypes.windll.shell32.IsUserAnAdmin()
         else:
@@ -136,10 +234,7 @@ def is_admin() -> bool:
 def get_network_info() -> Dict[str, Any]:
     """Get basic network information."""
     try:
-        import socket
-        
-        hostname = socket.gethostname()
-        local_ip = socket.gethostbyname(hostname)
+        hostname, local_ip = _host_addresses()
         
         return {
             'hostname': hostname,
@@ -153,39 +248,57 @@ def get_network_info() -> Dict[str, Any]:
             'has_internet': False
         }
 
+@functools.lru_cache(maxsize=1)
+def _host_addresses():
+    """Hostname and local IP; resolved once since they rarely change while running."""
+    hostname = socket.gethostname()
+    return hostname, socket.gethostbyname(hostname)
+
+# Seconds a connectivity result is served before it is re-probed
+_NET_TTL = 30.0
+_net_cache = {'ok': None, 'time': 0.0}
+_net_refresh = threading.Lock()
+
 def check_internet_connection() -> bool:
-    """Check if internet connection is available."""
+    """Check if internet connection is available.
+
+    Only the first call waits for the probe. After that the last result is
+    returned at once, and a stale one is refreshed on a background thread.
+    """
+    if _net_cache['ok'] is None:
+        _probe_internet()
+    elif time.monotonic() - _net_cache['time'] >= _NET_TTL and _net_refresh.acquire(blocking=False):
+        def refresh():
+            try:
+                _probe_internet()
+            finally:
+                _net_refresh.release()
+        threading.Thread(target=refresh, name="internet-probe", daemon=True).start()
+    return _net_cache['ok']
+
+def _probe_internet():
+    """Try a TCP connection to a public DNS server and record the result."""
     try:
-        import socket
-        socket.create_connection(("8.8.8.8", 53), timeout=3)
-        return True
-    except:
-        return False
+        with socket.create_connection(("8.8.8.8", 53), timeout=1.5):
+            ok = True
+    except OSError:
+        ok = False
+    _net_cache.update(ok=ok, time=time.monotonic())
+
+INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for cross-platform compatibility."""
-    import re
-    
-    # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    
-    # Remove leading/trailing whitespace and dots
-    filename = filename.strip(' .')
-    
-    # Ensure it's not empty
-    if not filename:
-        filename = 'unnamed'
+    # Replace invalid characters, then trim whitespace and dots; never return empty
+    filename = INVALID_FILENAME_CHARS.sub('_', filename).strip(' .') or 'unnamed'
     
     # Limit length
-    if len(filename) > 255:
-        filename = filename[:255]
-    
-    return filename
+    return filename[:255]
 
 def create_desktop_shortcut(name: str, target: str, description: str = "") -> bool:
     """Create desktop shortcut (Windows only)."""
     try:
-        if platform.system() != "Windows":
+        if not IS_WINDOWS:
             return False
             
         import winshell
@@ -205,24 +318,70 @@ def create_desktop_shortcut(name: str, target: str, description: str = "") -> bo
     except:
         return False
 
+APPS_CACHE_FILE = Path.home() / ".agent_desktop_ai" / "cache" / "installed_apps.json"
+
 def get_installed_apps() -> List[Dict[str, str]]:
-    """Get list of installed applications."""
+    """Get list of installed applications.
+
+    Results are cached on disk and reused until the app directory (or the
+    Uninstall registry keys) changes.
+    """
+    validator = _installed_apps_validator()
+    if validator is not None:
+        try:
+            with open(APPS_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+            if cached.get('validator') == validator:
+                return cached['apps']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+    
     apps = []
-    system = platform.system()
     
     try:
-        if system == "Windows":
+        if IS_WINDOWS:
             apps = _get_windows_apps()
-        elif system == "Darwin":
+        elif SYSTEM == "Darwin":
             apps = _get_macos_apps()
-        elif system == "Linux":
+        elif SYSTEM == "Linux":
             apps = _get_linux_apps()
     except:
         pass
     
+    if validator is not None:
+        try:
+            APPS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = APPS_CACHE_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'validator': validator, 'apps': apps}, f)
+            os.replace(tmp_file, APPS_CACHE_FILE)
+        except OSError:
+            pass
+    
     return apps
 
-def _get_windows_apps() -> List[Dict[str, str]]:
+def _installed_apps_validator() -> Optional[List[Any]]:
+    """Modification stamps of the app sources; None if they can't be read."""
+    try:
+        if IS_WINDOWS:
+            import winreg
+            stamps = []
+            for hkey in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+                try:
+                    with winreg.OpenKey(hkey, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall") as reg_key:
+                        stamps.append(winreg.QueryInfoKey(reg_key)[2])  # Last write time
+                except OSError:
+                    stamps.append(None)
+            return [SYSTEM] + stamps
+        if SYSTEM == "Darwin":
+            return [SYSTEM, os.stat("/Applications").st_mtime_ns]
+        if SYSTEM == "Linux":
+            return [SYSTEM, os.stat("/usr/share/applications").st_mtime_ns]
+    except (ImportError, OSError):
+        pass
+    return None
+
+def _get_windows_apps(limit: int = 20) -> List[Dict[str, str]]:
     """Get installed Windows applications."""
     apps = []
     try:
@@ -234,81 +393,100 @@ def _get_windows_apps() -> List[Dict[str, str]]:
             (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
         ]
         
+        # Hives are read lazily, so the scan ends as soon as there are enough apps
         for hkey, subkey in keys:
-            try:
-                with winreg.OpenKey(hkey, subkey) as reg_key:
-                    for i in range(winreg.QueryInfoKey(reg_key)[0]):
-                        try:
-                            app_key = winreg.EnumKey(reg_key, i)
-                            with winreg.OpenKey(reg_key, app_key) as app_reg:
-                                name = winreg.QueryValueEx(app_reg, "DisplayName")[0]
-                                try:
-                                    install_location = winreg.QueryValueEx(app_reg, "InstallLocation")[0]
-                                except FileNotFoundError:
-                                    install_location = ""
-                                
-                                apps.append({
-                                    'name': name,
-                                    'path': install_location
-                                })
-                        except:
-                            continue
-            except:
-                continue
+            for app in _read_uninstall_hive(winreg, hkey, subkey):
+                apps.append(app)
+                if len(apps) >= limit:
+                    return apps
                 
     except ImportError:
         pass
     
-    return apps[:20]  # Limit to first 20 apps
+    return apps
+
+def _read_uninstall_hive(winreg, hkey, subkey):
+    """Yield {'name', 'path'} for each entry with a DisplayName under an Uninstall key."""
+    try:
+        with winreg.OpenKey(hkey, subkey) as reg_key:
+            count = winreg.QueryInfoKey(reg_key)[0]
+            for i in range(count):
+                try:
+                    app_key = winreg.EnumKey(reg_key, i)
+                    with winreg.OpenKey(reg_key, app_key) as app_reg:
+                        name = winreg.QueryValueEx(app_reg, "DisplayName")[0]
+                        try:
+                            install_location = winreg.QueryValueEx(app_reg, "InstallLocation")[0]
+                        except FileNotFoundError:
+                            install_location = ""
+                except:
+                    continue
+                
+                yield {
+                    'name': name,
+                    'path': install_location
+                }
+    except:
+        return
 
 def _get_macos_apps() -> List[Dict[str, str]]:
     """Get installed macOS applications."""
+    try:
+        # A plain directory listing; no per-entry Path objects or pattern matching
+        with os.scandir("/Applications") as entries:
+            return [
+                {'name': entry.name[:-4], 'path': entry.path}
+                for entry in entries
+                if entry.name.endswith('.app')
+            ]
+    except OSError:
+        return []
+
+def _get_linux_apps(limit: int = 20) -> List[Dict[str, str]]:
+    """Get installed Linux applications."""
     apps = []
     try:
-        apps_dir = Path("/Applications")
-        if apps_dir.exists():
-            for app_path in apps_dir.glob("*.app"):
-                apps.append({
-                    'name': app_path.stem,
-                    'path': str(app_path)
-                })
+        # Check /usr/share/applications for .desktop files, stopping as soon as
+        # there are enough apps rather than parsing every file
+        for desktop_file in Path("/usr/share/applications").glob("*.desktop"):
+            app = _parse_desktop_file(desktop_file)
+            if app:
+                apps.append(app)
+                if len(apps) >= limit:
+                    break
+                
     except:
         pass
     
     return apps
 
-def _get_linux_apps() -> List[Dict[str, str]]:
-    """Get installed Linux applications."""
-    apps = []
+def _parse_desktop_file(desktop_file: Path) -> Optional[Dict[str, str]]:
+    """Extract Name and Exec from a .desktop file, or None if it can't be used."""
     try:
-        # Check /usr/share/applications for .desktop files
-        desktop_files = Path("/usr/share/applications").glob("*.desktop")
+        with open(desktop_file, 'rb') as f:
+            # Leading newline so a key on the first line matches like the rest
+            blob = b'\n' + f.read()
         
-        for desktop_file in desktop_files:
-            try:
-                with open(desktop_file, 'r') as f:
-                    content = f.read()
-                    
-                # Extract Name and Exec from .desktop file
-                name = ""
-                exec_path = ""
-                
-                for line in content.split('\n'):
-                    if line.startswith('Name=') and not name:
-                        name = line.split('=', 1)[1]
-                    elif line.startswith('Exec='):
-                        exec_path = line.split('=', 1)[1].split()[0]
-                
-                if name:
-                    apps.append({
-                        'name': name,
-                        'path': exec_path
-                    })
-                    
-            except:
-                continue
-                
+        # First Name= and last Exec=, found by byte search; only the two values get decoded
+        name = _desktop_value(blob, blob.find(b'\nName='))
+        exec_line = _desktop_value(blob, blob.rfind(b'\nExec='))
+        exec_path = exec_line.split()[0] if exec_line is not None else ""
+        
+        if name:
+            return {
+                'name': name,
+                'path': exec_path
+            }
     except:
         pass
-    
-    return apps[:20]  # Limit to first 20 apps
+    return None
+
+def _desktop_value(blob: bytes, key_start: int) -> Optional[str]:
+    """Decode the value of the `\nKey=` line found at key_start, or None if not found."""
+    if key_start == -1:
+        return None
+    start = blob.index(b'=', key_start) + 1
+    end = blob.find(b'\n', start)
+    if end == -1:
+        end = len(blob)
+    return blob[start:end].rstrip(b'\r').decode('utf-8', 'replace')
@@ -2,15 +2,90 @@
 History Logger - Manages interaction history with rotation and size limits
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
+import threading
 import time
+from collections import Counter, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
+
+try:
+    import orjson  # Optional fast JSON codec
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_log_listener = None
+
+def _start_log_listener(listener: logging.handlers.QueueListener):
+    """Start the root logger's listener, replacing one from an earlier HistoryLogger."""
+    global _log_listener
+    _stop_log_listener()
+    _log_listener = listener
+    listener.start()
+
+def _stop_log_listener():
+    """Write out queued log records and close their handlers."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
+
+def _encode_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one entry as a compact JSON line."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str,
+                            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(entry, default=str) + '\n').encode('utf-8')
+
+_decode_line = orjson.loads if orjson is not None else json.loads
+
+class _HistoryStats:
+    """Running totals over the entries currently in the history files."""
+    
+    def __init__(self):
+        self.successful = 0
+        self.failed = 0
+        self.errors = 0
+        self.intents = Counter()
+        self.timestamps = deque()  # Interaction times, oldest first
+    
+    def add_interactions(self, entries):
+        """Count interaction entries as they are written."""
+        for entry in entries:
+            if entry.get('success'):
+                self.successful += 1
+            else:
+                self.failed += 1
+            self.intents[entry.get('intent', {}).get('intent', 'unknown')] += 1
+            self.timestamps.append(entry.get('timestamp', 0))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the statistics in get_statistics() form."""
+        # Recent activity covers the last 24 hours
+        one_day_ago = time.time() - (24 * 60 * 60)
+        while self.timestamps and self.timestamps[0] <= one_day_ago:
+            self.timestamps.popleft()
+        
+        return {
+            'total_interactions': self.successful + self.failed,
+            'successful_interactions': self.successful,
+            'failed_interactions': self.failed,
+            'total_errors': self.errors,
+            'most_used_intents': dict(self.intents.most_common(20)),
+            'recent_activity': len(self.timestamps)  # Interactions in the last 24 hours
+        }
+
 class HistoryLogger:
     """Logs user interactions and system responses with rotation."""
     
@@ -21,13 +96,33 @@ class HistoryLogger:
             self.log_dir = Path.home() / ".agent_desktop_ai" / "logs"
         
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.history_file = self.log_dir / "history.json"
-        self.error_file = self.log_dir / "errors.json"
+        # JSON Lines: one entry per line, so logging appends instead of rewriting
+        self.history_file = self.log_dir / "history.jsonl"
+        self.error_file = self.log_dir / "errors.jsonl"
         
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.max_files = max_files
+        self.max_entries = 1000
+        # Per-file line counts and sizes, tracked as entries are written so
+        # trimming and rotation checks don't have to read or stat the files
+        self._line_counts = {}
+        self._file_sizes = {}
+        
+        # Statistics are built from the files once, then kept current as entries
+        # are written; None means they must be rebuilt (after a trim or rotation)
+        self._stats = None
+        self._stats_lock = threading.Lock()
         
         self._setup_logging()
+        
+        for file_path in (self.history_file, self.error_file):
+            self._migrate_legacy_file(file_path)
+        
+        # Entries are written by a background thread so callers never wait on disk
+        self._pending = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
     
     def _setup_logging(self):
         """Setup Python logging configuration."""
@@ -38,8 +133,10 @@ class HistoryLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
-        # Create file handler
-        file_handler = logging.FileHandler(log_file)
+        # Create file handler; agent.log rotates with the same limits as the history files
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=self.max_size_bytes, backupCount=self.max_files
+        )
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(formatter)
         
@@ -55,24 +152,25 @@ class HistoryLogger:
         # Clear existing handlers
         root_logger.handlers.clear()
         
-        # Add new handlers
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        # Callers only enqueue records; a listener thread does the formatting and I/O
+        log_queue = queue.Queue(-1)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _start_log_listener(logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        ))
     
     def log_interaction(self, user_input: str, intent: Dict[str, Any], result: Dict[str, Any]):
         """Log a complete user interaction."""
         try:
             entry = {
-                'timestamp': time.time(),
-                'datetime': datetime.now().isoformat(),
+                'timestamp': time.time(),  # Readers derive 'datetime' from this
                 'user_input': user_input,
                 'intent': intent,
                 'result': result,
                 'success': result.get('success', False)
             }
             
-            self._append_to_file(self.history_file, entry)
-            self._rotate_if_needed(self.history_file)
+            self._pending.put((self.history_file, entry))
             
             logger.info(f"Logged interaction: {intent.get('intent', 'unknown')} - {'SUCCESS' if entry['success'] else 'FAILED'}")
             
@@ -84,59 +182,147 @@ class HistoryLogger:
         try:
             entry = {
                 'timestamp': time.time(),
-                'datetime': datetime.now().isoformat(),
                 'error': error_message,
                 'context': context or {}
             }
             
-            self._append_to_file(self.error_file, entry)
-            self._rotate_if_needed(self.error_file)
+            self._pending.put((self.error_file, entry))
             
             logger.error(f"Logged error: {error_message}")
             
         except Exception as e:
             logger.error(f"Failed to log error: {e}")
     
-    def _append_to_file(self, file_path: Path, entry: Dict[str, Any]):
-        """Append entry to JSON file."""
-        entries = []
+    def flush(self):
+        """Block until every queued entry has been written."""
+        self._pending.join()
+    
+    def _write_loop(self, batch_size: int = 128, batch_window: float = 0.5):
+        """Write queued entries in batches, one append per file per batch."""
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + batch_window
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            by_file = {}
+            for file_path, entry in batch:
+                by_file.setdefault(file_path, []).append(entry)
+            
+            for file_path, entries in by_file.items():
+                try:
+                    with self._stats_lock:
+                        self._append_to_file(file_path, entries)
+                        if self._stats is not None:
+                            if file_path == self.error_file:
+                                self._stats.errors += len(entries)
+                            else:
+                                self._stats.add_interactions(entries)
+                        self._trim_if_needed(file_path)
+                        self._rotate_if_needed(file_path)
+                except Exception as e:
+                    logger.error(f"Failed to write {file_path.name}: {e}")
+            
+            for _ in batch:
+                self._pending.task_done()
+    
+    def _append_to_file(self, file_path: Path, new_entries: List[Dict[str, Any]]):
+        """Append entries to a JSON Lines file in a single write."""
+        data = b''.join(_encode_line(entry) for entry in new_entries)
+        with open(file_path, 'ab') as f:
+            f.write(data)
         
-        # Load existing entries
-        if file_path.exists():
-            try:
-                with open(file_path, 'r') as f:
-                    entries = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                entries = []
+        if file_path in self._line_counts:
+            self._line_counts[file_path] += len(new_entries)
+        if file_path in self._file_sizes:
+            self._file_sizes[file_path] += len(data)
+    
+    def _trim_if_needed(self, file_path: Path):
+        """Keep only the last max_entries entries to prevent unbounded growth.
         
-        # Add new entry
-        entries.append(entry)
+        The file may grow to twice the limit before it is rewritten, so the
+        cost of trimming is spread over many appends.
+        """
+        if file_path not in self._line_counts:
+            with open(file_path, 'rb') as f:
+                self._line_counts[file_path] = sum(1 for _ in f)
         
-        # Keep only last 1000 entries to prevent unbounded growth
-        entries = entries[-1000:]
+        if self._line_counts[file_path] <= 2 * self.max_entries:
+            return
         
-        # Save back to file
-        with open(file_path, 'w') as f:
-            json.dump(entries, f, indent=2, default=str)
+        with open(file_path, 'rb') as f:
+            lines = deque(f, maxlen=self.max_entries)
+        tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.writelines(lines)
+        tmp_path.replace(file_path)
+        self._line_counts[file_path] = len(lines)
+        self._stats = None
+        self._file_sizes.pop(file_path, None)
+    
+    def _migrate_legacy_file(self, file_path: Path):
+        """Convert a history file from the old single-JSON-array format."""
+        legacy_path = file_path.with_suffix('.json')
+        if file_path.exists() or not legacy_path.exists():
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                entries = json.load(f)
+            self._append_to_file(file_path, entries[-self.max_entries:])
+            legacy_path.unlink()
+            logger.info(f"Converted {legacy_path.name} to {file_path.name}")
+        except Exception as e:
+            logger.error(f"Failed to convert {legacy_path.name}: {e}")
+    
+    def _read_entries(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield entries from a JSON Lines file, skipping damaged lines."""
+        if not file_path.exists():
+            return
+        with open(file_path, 'rb') as f:
+            for line in f:
+                try:
+                    yield _decode_line(line)
+                except ValueError:
+                    continue
+    
+    def _tail(self, file_path: Path, count: int) -> List[Dict[str, Any]]:
+        """Return the last `count` entries of a JSON Lines file."""
+        if count <= 0:
+            return []
+        entries = list(deque(self._read_entries(file_path), maxlen=count))
+        # Entries store only the epoch timestamp; format it for the few returned
+        for entry in entries:
+            if 'datetime' not in entry and 'timestamp' in entry:
+                entry['datetime'] = datetime.fromtimestamp(entry['timestamp']).isoformat()
+        return entries
     
     def _rotate_if_needed(self, file_path: Path):
         """Rotate log file if it exceeds size limit."""
         try:
-            if not file_path.exists():
-                return
-            
-            file_size = file_path.stat().st_size
+            if file_path not in self._file_sizes:
+                if not file_path.exists():
+                    return
+                self._file_sizes[file_path] = file_path.stat().st_size
             
-            if file_size > self.max_size_bytes:
+            if self._file_sizes[file_path] > self.max_size_bytes:
                 logger.info(f"Rotating log file: {file_path}")
                 
                 # Create rotated filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                rotated_name = f"{file_path.stem}_{timestamp}.json"
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                rotated_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
                 rotated_path = file_path.parent / rotated_name
                 
                 # Move current file to rotated name
                 file_path.rename(rotated_path)
+                self._line_counts[file_path] = 0
+                self._stats = None
+                self._file_sizes[file_path] = 0
                 
                 # Clean up old rotated files
                 self._cleanup_old_files(file_path)
@@ -147,7 +333,7 @@ class HistoryLogger:
     def _cleanup_old_files(self, base_file: Path):
         """Remove old rotated log files beyond max_files limit."""
         try:
-            pattern = f"{base_file.stem}_*.json"
+            pattern = f"{base_file.stem}_*{base_file.suffix}"
             rotated_files = list(base_file.parent.glob(pattern))
             
             # Sort by modification time (oldest first)
@@ -164,14 +350,9 @@ class HistoryLogger:
     
     def get_recent_interactions(self, count: int = 10) -> List[Dict[str, Any]]:
         """Get recent user interactions."""
+        self.flush()
         try:
-            if not self.history_file.exists():
-                return []
-            
-            with open(self.history_file, 'r') as f:
-                entries = json.load(f)
-            
-            return entries[-count:]
+            return self._tail(self.history_file, count)
             
         except Exception as e:
             logger.error(f"Failed to get recent interactions: {e}")
@@ -179,14 +360,9 @@ class HistoryLogger:
     
     def get_recent_errors(self, count: int = 10) -> List[Dict[str, Any]]:
         """Get recent errors."""
+        self.flush()
         try:
-            if not self.error_file.exists():
-                return []
-            
-            with open(self.error_file, 'r') as f:
-                entries = json.load(f)
-            
-            return entries[-count:]
+            return self._tail(self.error_file, count)
             
         except Exception as e:
             logger.error(f"Failed to get recent errors: {e}")
@@ -194,66 +370,45 @@ class HistoryLogger:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get usage statistics."""
+        self.flush()
         try:
-            stats = {
-                'total_interactions': 0,
-                'successful_interactions': 0,
-                'failed_interactions': 0,
-                'total_errors': 0,
-                'most_used_intents': {},
-                'recent_activity': []
-            }
-            
-            # Process history file
-            if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    history = json.load(f)
-                
-                stats['total_interactions'] = len(history)
-                
-                for entry in history:
-                    if entry.get('success'):
-                        stats['successful_interactions'] += 1
-                    else:
-                        stats['failed_interactions'] += 1
-                    
-                    intent_type = entry.get('intent', {}).get('intent', 'unknown')
-                    stats['most_used_intents'][intent_type] = stats['most_used_intents'].get(intent_type, 0) + 1
-                
-                # Get recent activity (last 24 hours)
-                current_time = time.time()
-                one_day_ago = current_time - (24 * 60 * 60)
-                
-                stats['recent_activity'] = [
-                    entry for entry in history
-                    if entry.get('timestamp', 0) > one_day_ago
-                ]
-            
-            # Process error file
-            if self.error_file.exists():
-                with open(self.error_file, 'r') as f:
-                    errors = json.load(f)
-                
-                stats['total_errors'] = len(errors)
-            
-            return stats
+            with self._stats_lock:
+                if self._stats is None:
+                    self._stats = self._load_statistics()
+                return self._stats.snapshot()
             
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
             return {'error': str(e)}
     
+    def _load_statistics(self) -> _HistoryStats:
+        """Build statistics from the history files in one streaming pass."""
+        stats = _HistoryStats()
+        stats.add_interactions(self._read_entries(self.history_file))
+        
+        # Errors only need counting, not parsing
+        if self.error_file.exists():
+            with open(self.error_file, 'rb') as f:
+                stats.errors = sum(1 for line in f if line.strip())
+        return stats
+    
     def clear_history(self):
         """Clear all history files."""
+        self.flush()
+        with self._stats_lock:
+            self._stats = None
         try:
             files_to_clear = [self.history_file, self.error_file]
             
             for file_path in files_to_clear:
+                self._line_counts.pop(file_path, None)
+                self._file_sizes.pop(file_path, None)
                 if file_path.exists():
                     file_path.unlink()
                     logger.info(f"Cleared history file: {file_path}")
             
             # Also clear rotated files
-            for pattern in ["history_*.json", "errors_*.json"]:
+            for pattern in ["history_*.jsonl", "errors_*.jsonl"]:
                 for old_file in self.log_dir.glob(pattern):
                     old_file.unlink()
                     logger.info(f"Removed old file: {old_file}")
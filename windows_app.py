@@ -7,13 +7,15 @@ A native Windows desktop application with modern UI using tkinter.
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import asyncio
+import functools
 import threading
-import json
+from concurrent.futures import ThreadPoolExecutor
 import platform
 import os
 import sys
+import time
+from collections import deque
 from pathlib import Path
-from datetime import datetime
 import webbrowser
 
 # Add current directory to path for imports
@@ -38,6 +40,48 @@ except ImportError:
             return None
 
 from utils.logger import HistoryLogger
+from utils.helpers import format_result_details
+
+# Fixed for the life of the process; architecture() may shell out to `file`
+OS_NAME = platform.system()
+PYTHON_VERSION = platform.python_version()
+ARCHITECTURE = platform.architecture()[0]
+
+# Header colors used by the chat; their text tags are configured up front
+CHAT_COLORS = ("#000000", "#0078d4", "#1f77b4", "#107c10", "#d73527", "#ff8c00", "#666666")
+
+# Display names for the capability checkboxes
+READABLE_CAP_NAMES = {
+    "fs": "📁 File System",
+    "process_control": "💻 Process Control",
+    "window_control": "🪟 Window Control",
+    "browser_control": "🌐 Browser Control",
+    "run_shell": "⚠️ Shell Commands"
+}
+
+# Longest details text shown in the chat
+MAX_DETAILS_CHARS = 8192
+
+# Layout for get_system_info results; defaults fill fields the result lacks
+SYSTEM_DETAILS_TEMPLATE = (
+    "\n💻 System Details:\n"
+    "  OS: {os}\n"
+    "  CPU Usage: {cpu_percent}%\n"
+    "  Memory Usage: {memory_percent}%\n"
+    "  Disk Usage: {disk_usage}%\n"
+)
+SYSTEM_DETAILS_DEFAULTS = {"os": "Unknown", "cpu_percent": 0, "memory_percent": 0, "disk_usage": 0}
+
+# Files shown for a directory listing before the rest are summarized
+MAX_LISTED_FILES = 500
+_KB = 1 << 10
+_MB = 1 << 20
+
+# Chat buffer limits for long sessions
+MAX_CHAT_MESSAGES = 1000
+MAX_CHAT_LINES = 5000
+# Line count is only checked every this many messages
+CHAT_TRIM_INTERVAL = 50
 
 
 class ModernScrolledText(scrolledtext.ScrolledText):
@@ -69,7 +113,7 @@ class StatusBar(ttk.Frame):
         # System info on the right
         self.system_info = ttk.Label(
             self, 
-            text=f"Windows • Python {platform.python_version()}", 
+            text=f"Windows • Python {PYTHON_VERSION}", 
             anchor=tk.E
         )
         self.system_info.pack(side=tk.RIGHT, padx=5)
@@ -77,7 +121,8 @@ class StatusBar(ttk.Frame):
     def set_status(self, message):
         """Update status message."""
         self.status_var.set(message)
-        self.update()
+        # Repaint only; update() would dispatch pending events re-entrantly
+        self.update_idletasks()
 
 
 class AgentDesktopWindows:
@@ -88,23 +133,64 @@ class AgentDesktopWindows:
         self.setup_window()
         self.setup_styles()
         
-        # Initialize AI components
+        # Safety settings are cheap and the UI needs them; the rest loads in the background
         self.dry_run = True
-        self.logger = HistoryLogger()
         self.safety_manager = SafetyManager()
         self.capability_manager = CapabilityManager()
-        self.llm_client = OllamaClient()
-        self.intent_parser = IntentParser(self.llm_client)
-        self.task_router = TaskRouter(self.safety_manager, self.capability_manager, dry_run=self.dry_run)
-        self.voice_recorder = VoiceRecorder()
+        self.logger = None
+        self.llm_client = None
+        self.intent_parser = None
+        self.task_router = None
+        self.voice_recorder = None
+        self._ready = False
+        
+        # One long-lived event loop so the Ollama client keeps its pooled connections
+        self._loop = asyncio.new_event_loop()
+        # Blocking work from commands (to_thread, run_in_executor) shares a capped pool
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent-cmd")
+        self._loop.set_default_executor(self._executor)
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="agent-loop", daemon=True)
+        self._loop_thread.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Chat history
-        self.chat_history = []
+        self.chat_history = deque(maxlen=MAX_CHAT_MESSAGES)
+        self._messages_since_trim = 0
+        # Header colors that already have a text tag
+        self._chat_tags = set()
+        self._scroll_pending = False
+        self._clear_dialog = None
         
         # Create UI
         self.create_ui()
         
-        # Start with a welcome message
+        # Build the AI components without blocking the first paint
+        self.status_bar.set_status("Loading AI components...")
+        self._executor.submit(self._init_backends)
+    
+    def _init_backends(self):
+        """Construct the AI components on a worker thread."""
+        try:
+            self.logger = HistoryLogger()
+            self.llm_client = OllamaClient()
+            self.intent_parser = IntentParser(self.llm_client)
+            self.task_router = TaskRouter(self.safety_manager, self.capability_manager, dry_run=self.dry_run)
+            self.voice_recorder = VoiceRecorder()
+        except Exception as e:
+            self.root.after(0, self.handle_command_error, f"Failed to load AI components: {str(e)}")
+            return
+        self.root.after(0, self._enable_ui)
+    
+    def _enable_ui(self):
+        """Unlock input once the AI components exist."""
+        # Pick up a dry run toggle made while loading
+        self.task_router.dry_run = self.dry_run
+        self._ready = True
+        # Open the pooled connection and load the model before the first command needs them
+        asyncio.run_coroutine_threadsafe(self.llm_client.warmup(), self._loop)
+        self.send_button.config(state=tk.NORMAL)
+        self.voice_button.config(state=tk.NORMAL)
+        self.status_bar.set_status("Ready")
         self.add_chat_message("Assistant", "🤖 Agent Desktop AI Extended is ready!\nType a command or click a quick action button.", "#1f77b4")
     
     def setup_window(self):
@@ -175,6 +261,8 @@ class AgentDesktopWindows:
             fg='black'
         )
         self.chat_display.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        for color in CHAT_COLORS:
+            self._add_chat_tag(color)
         
         # Input area
         input_frame = ttk.Frame(chat_frame)
@@ -185,12 +273,12 @@ class AgentDesktopWindows:
         command_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         command_entry.bind('<Return>', lambda e: self.send_command())
         
-        send_button = ttk.Button(input_frame, text="Send", command=self.send_command, style='Action.TButton')
-        send_button.pack(side=tk.RIGHT)
+        self.send_button = ttk.Button(input_frame, text="Send", command=self.send_command, style='Action.TButton', state=tk.DISABLED)
+        self.send_button.pack(side=tk.RIGHT)
         
         # Voice button
-        voice_button = ttk.Button(input_frame, text="🎤", command=self.voice_command, width=4)
-        voice_button.pack(side=tk.RIGHT, padx=(0, 5))
+        self.voice_button = ttk.Button(input_frame, text="🎤", command=self.voice_command, width=4, state=tk.DISABLED)
+        self.voice_button.pack(side=tk.RIGHT, padx=(0, 5))
         
         # Right panel - Controls
         control_frame = ttk.Frame(content_frame)
@@ -218,21 +306,14 @@ class AgentDesktopWindows:
         
         self.capability_vars = {}
         capabilities = self.capability_manager.get_capabilities()
+        # What the manager last saw, so updates only send what changed
+        self._last_capabilities = dict(capabilities)
         
         for cap_name, cap_enabled in capabilities.items():
             var = tk.BooleanVar(value=cap_enabled)
             self.capability_vars[cap_name] = var
             
-            # Create readable names
-            readable_names = {
-                "fs": "📁 File System",
-                "process_control": "💻 Process Control",
-                "window_control": "🪟 Window Control",
-                "browser_control": "🌐 Browser Control",
-                "run_shell": "⚠️ Shell Commands"
-            }
-            
-            display_name = readable_names.get(cap_name, cap_name)
+            display_name = READABLE_CAP_NAMES.get(cap_name, cap_name)
             check = ttk.Checkbutton(
                 capabilities_frame,
                 text=display_name,
@@ -256,7 +337,7 @@ class AgentDesktopWindows:
             btn = ttk.Button(
                 actions_frame,
                 text=button_text,
-                command=lambda cmd=command: self.quick_action(cmd),
+                command=functools.partial(self.quick_action, command),
                 style='Action.TButton'
             )
             btn.pack(fill=tk.X, pady=2)
@@ -265,7 +346,7 @@ class AgentDesktopWindows:
         info_frame = ttk.LabelFrame(control_frame, text="📊 System Info", padding=10)
         info_frame.pack(fill=tk.X, pady=(0, 10))
         
-        info_text = f"OS: {platform.system()}\nPython: {platform.python_version()}\nArchitecture: {platform.architecture()[0]}"
+        info_text = f"OS: {OS_NAME}\nPython: {PYTHON_VERSION}\nArchitecture: {ARCHITECTURE}"
         info_label = ttk.Label(info_frame, text=info_text, justify=tk.LEFT)
         info_label.pack(anchor=tk.W)
         
@@ -288,19 +369,29 @@ class AgentDesktopWindows:
     
     def add_chat_message(self, sender, message, color="#000000"):
         """Add a message to the chat display."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        # Local wall-clock time without building a datetime or going through strftime
+        now = time.localtime()
+        timestamp = f"{now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}"
         
-        self.chat_display.config(state=tk.NORMAL)
-        
-        # Add timestamp and sender
-        self.chat_display.insert(tk.END, f"[{timestamp}] {sender}: ", f"sender_{sender}")
-        self.chat_display.tag_config(f"sender_{sender}", foreground=color, font=('Segoe UI', 10, 'bold'))
-        
-        # Add message
-        self.chat_display.insert(tk.END, f"{message}\n\n")
+        # Tags are per color so earlier headers keep theirs
+        if color not in self._chat_tags:
+            self._add_chat_tag(color)
+        tag = f"header_{color}"
         
+        # Header and body in one insert: (text, tags, text) pairs
+        self.chat_display.config(state=tk.NORMAL)
+        self.chat_display.insert(tk.END, f"[{timestamp}] {sender}: ", tag, f"{message}\n\n")
+        self._messages_since_trim += 1
+        if self._messages_since_trim >= CHAT_TRIM_INTERVAL:
+            self._messages_since_trim = 0
+            lines = int(self.chat_display.index('end-1c').split('.')[0])
+            if lines > MAX_CHAT_LINES:
+                self.chat_display.delete('1.0', f'{lines - MAX_CHAT_LINES + 1}.0')
         self.chat_display.config(state=tk.DISABLED)
-        self.chat_display.see(tk.END)
+        # One scroll per idle cycle, however many messages arrive in it
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.chat_display.after_idle(self._scroll_to_end)
         
         # Store in history
         self.chat_history.append({
@@ -309,6 +400,16 @@ class AgentDesktopWindows:
             "message": message
         })
     
+    def _scroll_to_end(self):
+        """Scroll the chat to the newest message."""
+        self._scroll_pending = False
+        self.chat_display.see(tk.END)
+    
+    def _add_chat_tag(self, color):
+        """Configure the bold header tag for a color."""
+        self.chat_display.tag_config(f"header_{color}", foreground=color, font=('Segoe UI', 10, 'bold'))
+        self._chat_tags.add(color)
+    
     def send_command(self):
         """Send a text command."""
         command = self.command_var.get().strip()
@@ -317,28 +418,35 @@ class AgentDesktopWindows:
         
         # Clear input
         self.command_var.set("")
+        self._dispatch_command(command)
+    
+    def _dispatch_command(self, command):
+        """Echo a command to the chat and process it in the background."""
+        if not self._ready:
+            self.status_bar.set_status("Still loading AI components...")
+            return
         
         # Add user message
         self.add_chat_message("You", command, "#0078d4")
         
         # Process command in background
         self.status_bar.set_status("Processing command...")
-        threading.Thread(target=self.process_command_async, args=(command,), daemon=True).start()
+        self._submit(self.process_text_command(command), self.handle_command_result, "Error processing command")
     
-    def process_command_async(self, command):
-        """Process command asynchronously."""
-        try:
-            # Run async command processing
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.process_text_command(command))
-            loop.close()
-            
-            # Update UI in main thread
-            self.root.after(0, self.handle_command_result, result)
-        except Exception as e:
-            error_msg = f"Error processing command: {str(e)}"
-            self.root.after(0, self.handle_command_error, error_msg)
+    def _submit(self, coro, callback, error_prefix):
+        """Run a coroutine on the background loop and hand its result to the UI thread."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        
+        def done(fut):
+            try:
+                result = fut.result()
+            except Exception as e:
+                self.root.after(0, self.handle_command_error, f"{error_prefix}: {str(e)}")
+            else:
+                self.root.after(0, callback, result)
+        
+        future.add_done_callback(done)
+        return future
     
     def handle_command_result(self, result):
         """Handle command result in main thread."""
@@ -347,56 +455,51 @@ class AgentDesktopWindows:
             message = result.get("message", "Task processed")
             intent_type = result.get("intent_type", "")
             
+            # Everything for this result goes out as one chat message
+            parts = [f"{'✅' if success else '❌'} {message}"]
+            
             if success:
-                self.add_chat_message("Assistant", f"✅ {message}", "#107c10")
-                
                 # Show specific content based on intent type
                 if intent_type == "list_files" and result.get("files"):
                     files = result["files"]
                     if files:
-                        file_list = "\n📁 Files and Folders:\n"
-                        for file_info in files:
+                        lines = ["\n📁 Files and Folders:\n"]
+                        format_size = self._format_size
+                        for file_info in files[:MAX_LISTED_FILES]:
                             name = file_info.get("name", "Unknown")
-                            file_type = file_info.get("type", "unknown")
-                            size = file_info.get("size", 0)
-                            
-                            if file_type == "directory":
-                                icon = "📁"
-                                size_str = "(folder)"
+                            if file_info.get("type") == "directory":
+                                lines.append(f"  📁 {name} (folder)\n")
                             else:
-                                icon = "📄"
-                                if size > 1024*1024:  # MB
-                                    size_str = f"({size/(1024*1024):.1f} MB)"
-                                elif size > 1024:  # KB
-                                    size_str = f"({size/1024:.1f} KB)"
-                                else:
-                                    size_str = f"({size} bytes)"
-                            
-                            file_list += f"  {icon} {name} {size_str}\n"
+                                lines.append(f"  📄 {name} {format_size(file_info.get('size', 0))}\n")
                         
-                        self.add_chat_message("Assistant", file_list, "#0078d4")
+                        if len(files) > MAX_LISTED_FILES:
+                            lines.append(f"  … and {len(files) - MAX_LISTED_FILES} more\n")
+                        parts.append("".join(lines))
                 
                 elif intent_type == "get_system_info" and result.get("system_info"):
-                    info = result["system_info"]
-                    system_details = f"\n💻 System Details:\n"
-                    system_details += f"  OS: {info.get('os', 'Unknown')}\n"
-                    system_details += f"  CPU Usage: {info.get('cpu_percent', 0)}%\n"
-                    system_details += f"  Memory Usage: {info.get('memory_percent', 0)}%\n"
-                    system_details += f"  Disk Usage: {info.get('disk_usage', 0)}%\n"
-                    self.add_chat_message("Assistant", system_details, "#0078d4")
-                
-            else:
-                self.add_chat_message("Assistant", f"❌ {message}", "#d73527")
+                    info = {**SYSTEM_DETAILS_DEFAULTS, **result["system_info"]}
+                    parts.append(SYSTEM_DETAILS_TEMPLATE.format_map(info))
+            
+            # Whatever else the command returned (file contents, processes, matches...)
+            details = result.get("_details_str")
+            if details:
+                parts.append(f"Details:\n{details}")
             
-            # Show raw details only if it's not a special case we handled above
-            if result.get("details") and intent_type not in ["list_files", "get_system_info"]:
-                details = json.dumps(result["details"], indent=2)
-                self.add_chat_message("Assistant", f"Details:\n{details}", "#666666")
+            self.add_chat_message("Assistant", "\n".join(parts), "#107c10" if success else "#d73527")
         else:
             self.add_chat_message("Assistant", "❌ Failed to process command", "#d73527")
         
         self.status_bar.set_status("Ready")
     
+    @staticmethod
+    def _format_size(size):
+        """Format a file size for the listing, e.g. "(1.5 KB)"."""
+        if size > _MB:
+            return f"({size / _MB:.1f} MB)"
+        if size > _KB:
+            return f"({size / _KB:.1f} KB)"
+        return f"({size} bytes)"
+    
     def handle_command_error(self, error_msg):
         """Handle command error in main thread."""
         self.add_chat_message("Assistant", f"❌ {error_msg}", "#d73527")
@@ -414,9 +517,11 @@ class AgentDesktopWindows:
             # Execute task
             result = await self.task_router.execute(intent)
             
-            # Log everything
-            self.logger.log_interaction(text, intent, result)
+            # Log everything; HistoryLogger writes on its own thread, so hand it a
+            # copy that the UI-side additions below can't change mid-write
+            self.logger.log_interaction(text, intent, dict(result))
             
+            self._render_details(result)
             return result
             
         except Exception as e:
@@ -424,8 +529,22 @@ class AgentDesktopWindows:
             self.logger.log_error(error_msg)
             return {"success": False, "message": error_msg}
     
+    @staticmethod
+    def _render_details(result):
+        """Serialize a result's payload here on the loop thread, not in Tk."""
+        if not result:
+            return
+        # Files and system info get their own layout in handle_command_result
+        text = format_result_details(result, skip=("files", "system_info"), max_chars=MAX_DETAILS_CHARS)
+        if text:
+            result["_details_str"] = text
+    
     def voice_command(self):
         """Handle voice command button click."""
+        if not self._ready:
+            self.status_bar.set_status("Still loading AI components...")
+            return
+        
         if not self.voice_recorder.is_available():
             messagebox.showwarning("Voice Not Available", "Voice recognition is not available. Please install voice dependencies.")
             return
@@ -434,20 +553,7 @@ class AgentDesktopWindows:
         self.status_bar.set_status("Recording voice...")
         
         # Process voice command in background
-        threading.Thread(target=self.process_voice_async, daemon=True).start()
-    
-    def process_voice_async(self):
-        """Process voice command asynchronously."""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.process_voice_command())
-            loop.close()
-            
-            self.root.after(0, self.handle_voice_result, result)
-        except Exception as e:
-            error_msg = f"Error processing voice: {str(e)}"
-            self.root.after(0, self.handle_command_error, error_msg)
+        self._submit(self.process_voice_command(), self.handle_voice_result, "Error processing voice")
     
     async def process_voice_command(self):
         """Process a voice command through the full pipeline."""
@@ -474,12 +580,13 @@ class AgentDesktopWindows:
             result = await self.task_router.execute(intent)
             
             # Log everything
-            self.logger.log_interaction(transcription, intent, result)
+            self.logger.log_interaction(transcription, intent, dict(result))
             
             # Add transcription to result
             if result:
                 result["transcription"] = transcription
             
+            self._render_details(result)
             return result
             
         except Exception as e:
@@ -496,19 +603,14 @@ class AgentDesktopWindows:
     
     def quick_action(self, command):
         """Execute a quick action command."""
-        self.command_var.set(command)
-        self.send_command()
+        self._dispatch_command(command)
     
     def toggle_dry_run(self):
         """Toggle dry run mode."""
         self.dry_run = self.dry_run_var.get()
-        
-        # Recreate task router with new dry run setting
-        self.task_router = TaskRouter(
-            self.safety_manager, 
-            self.capability_manager, 
-            dry_run=self.dry_run
-        )
+        # The router reads dry_run per call, so flip it in place
+        if self.task_router is not None:
+            self.task_router.dry_run = self.dry_run
         
         # Update status
         if self.dry_run:
@@ -520,25 +622,60 @@ class AgentDesktopWindows:
     
     def update_capabilities(self):
         """Update capability settings."""
-        new_capabilities = {}
+        changed = {}
         for cap_name, var in self.capability_vars.items():
-            new_capabilities[cap_name] = var.get()
+            enabled = var.get()
+            if enabled != self._last_capabilities.get(cap_name):
+                changed[cap_name] = enabled
         
-        self.capability_manager.update_capabilities(new_capabilities)
+        # Spurious variable traces change nothing and shouldn't post a message
+        if not changed:
+            return
+        
+        # Each update rewrites capabilities.json, so only send the deltas
+        self.capability_manager.update_capabilities(changed)
+        self._last_capabilities.update(changed)
         
-        # Show enabled capabilities
-        enabled = [name for name, enabled in new_capabilities.items() if enabled]
-        if enabled:
-            self.add_chat_message("System", f"🔧 Enabled capabilities: {', '.join(enabled)}", "#666666")
+        summary = ", ".join(f"{'+' if enabled else '−'}{READABLE_CAP_NAMES.get(name, name)}"
+                            for name, enabled in changed.items())
+        self.add_chat_message("System", f"🔧 Capabilities: {summary}", "#666666")
     
     def clear_chat(self):
-        """Clear the chat history."""
-        if messagebox.askyesno("Clear Chat", "Are you sure you want to clear the chat history?"):
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.delete(1.0, tk.END)
-            self.chat_display.config(state=tk.DISABLED)
-            self.chat_history.clear()
-            self.add_chat_message("Assistant", "🤖 Chat cleared. How can I help you?", "#1f77b4")
+        """Ask to clear the chat history."""
+        # A Toplevel instead of askyesno: the native modal runs a nested loop that
+        # holds back results arriving from background commands
+        if self._clear_dialog is not None:
+            self._clear_dialog.lift()
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Clear Chat")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self._confirm_clear(False))
+        self._clear_dialog = dialog
+        
+        ttk.Label(dialog, text="Are you sure you want to clear the chat history?").pack(padx=20, pady=(20, 10))
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=(0, 15))
+        ttk.Button(buttons, text="Yes", command=lambda: self._confirm_clear(True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="No", command=lambda: self._confirm_clear(False)).pack(side=tk.LEFT, padx=5)
+        dialog.grab_set()
+    
+    def _confirm_clear(self, confirmed):
+        """Close the clear-chat dialog and clear if confirmed."""
+        if self._clear_dialog is not None:
+            self._clear_dialog.destroy()
+            self._clear_dialog = None
+        if not confirmed:
+            return
+        
+        self.chat_display.config(state=tk.NORMAL)
+        self.chat_display.delete(1.0, tk.END)
+        self.chat_display.config(state=tk.DISABLED)
+        self.chat_history.clear()
+        self._messages_since_trim = 0
+        self.add_chat_message("Assistant", "🤖 Chat cleared. How can I help you?", "#1f77b4")
     
     def show_settings(self):
         """Show settings dialog."""
@@ -595,15 +732,29 @@ Licensed under MIT License"""
         
         messagebox.showinfo(
             "About Agent Desktop AI Extended",
-            about_text.format(python_version=platform.python_version())
+            about_text.format(python_version=PYTHON_VERSION)
         )
     
+    def on_close(self):
+        """Release the LLM client and stop the background loop before closing."""
+        if self.llm_client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.llm_client.aclose(), self._loop).result(timeout=2)
+            except Exception:
+                pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.logger is not None:
+            # The writer thread is a daemon; don't drop entries still queued
+            self.logger.flush()
+        self.root.destroy()
+    
     def run(self):
         """Start the application."""
         try:
             self.root.mainloop()
         except KeyboardInterrupt:
-            self.root.quit()
+            self.on_close()
 
 
 def main():